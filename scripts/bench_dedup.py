@@ -0,0 +1,59 @@
+"""Benchmark the ingestion-time deduplicator on synthetic retransmitted data.
+
+Usage: python scripts/bench_dedup.py --rows 100000000 --sensors 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import time
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from solid_engine.dedup import Deduplicator
+from solid_engine.models import SensorReading
+
+
+def _stream(rows: int, sensors: int, duplicate_every: int) -> Iterator[SensorReading]:
+    base = datetime(2025, 1, 1)
+    emitted = 0
+    minute = 0
+    while emitted < rows:
+        recorded_at = base + timedelta(minutes=minute)
+        for sensor in range(sensors):
+            reading = SensorReading(f"sensor-{sensor}", recorded_at, 10.0, 10.0)
+            yield reading
+            emitted += 1
+            if duplicate_every and emitted % duplicate_every == 0:
+                yield reading
+                emitted += 1
+            if emitted >= rows:
+                return
+        minute += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sensors", type=int, default=1_000)
+    parser.add_argument("--duplicate-every", type=int, default=20)
+    parser.add_argument("--policy", default="first")
+    parser.add_argument("--unordered", action="store_true")
+    parser.add_argument("--bloom-capacity", type=int)
+    args = parser.parse_args()
+
+    deduplicator = Deduplicator(
+        policy=args.policy, ordered=not args.unordered, bloom_capacity=args.bloom_capacity
+    )
+    started = time.perf_counter()
+    for _ in deduplicator.process(_stream(args.rows, args.sensors, args.duplicate_every)):
+        pass
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"stats: {deduplicator.stats.to_dict()}")
+    print(f"elapsed: {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s), peak RSS: {peak_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
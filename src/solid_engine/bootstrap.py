@@ -0,0 +1,104 @@
+"""Bootstrap confidence intervals for per-sensor reliability metrics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from .models import SensorReading
+
+# Upper bound on resampled values per block. Each costs about 25 bytes at
+# peak (int64 index, float64 sample, float64 temporary inside std(), bool
+# outlier flag), so the default block peaks near 100 MB.
+DEFAULT_MAX_ELEMENTS = 4_000_000
+
+
+@dataclass
+class MetricIntervals:
+    """Percentile bootstrap intervals for one sensor."""
+
+    sensor_id: str
+    count: int
+    average_delta: tuple[float, float]
+    std_dev: tuple[float, float]
+    outlier_ratio: tuple[float, float]
+
+    def to_dict(self) -> dict[str, str | int | list[float]]:
+        """Convert intervals to dictionary format."""
+        return {
+            "sensor_id": self.sensor_id,
+            "count": self.count,
+            "average_delta": [round(bound, 4) for bound in self.average_delta],
+            "std_dev": [round(bound, 4) for bound in self.std_dev],
+            "outlier_ratio": [round(bound, 4) for bound in self.outlier_ratio],
+        }
+
+
+def bootstrap_intervals(
+    readings: Iterable[SensorReading],
+    *,
+    replicates: int = 1000,
+    confidence: float = 0.95,
+    outlier_threshold: float = 5.0,
+    seed: int = 42,
+    max_elements: int = DEFAULT_MAX_ELEMENTS,
+) -> list[MetricIntervals]:
+    """
+    Estimate intervals for average_delta, std_dev and outlier_ratio per sensor.
+
+    Sensors with the same number of readings are stacked into one matrix and
+    all replicates are drawn as a single index array, so the work is done in
+    numpy rather than by calling ``ReliabilityMetrics.from_readings`` per
+    replicate. Blocks are sized to keep at most ``max_elements`` resampled
+    values in memory.
+    """
+    if replicates < 1:
+        raise ValueError("replicates must be at least 1")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if outlier_threshold < 0:
+        raise ValueError("outlier_threshold must be non-negative")
+
+    deltas: dict[str, list[float]] = {}
+    for reading in readings:
+        deltas.setdefault(reading.sensor_id, []).append(reading.delta)
+    by_size: dict[int, list[str]] = {}
+    for sensor_id, values in deltas.items():
+        by_size.setdefault(len(values), []).append(sensor_id)
+
+    rng = np.random.default_rng(seed)
+    quantiles = [(1 - confidence) / 2, (1 + confidence) / 2]
+    results: dict[str, MetricIntervals] = {}
+    for size, sensor_ids in by_size.items():
+        data = np.array([deltas[sensor_id] for sensor_id in sensor_ids])
+        # Resampling precomputed flags keeps the outlier test to one byte per value.
+        flags = np.abs(data) >= outlier_threshold
+        sensors_per_block = max(1, max_elements // (replicates * size))
+        replicates_per_block = max(1, min(replicates, max_elements // size))
+        for first in range(0, len(sensor_ids), sensors_per_block):
+            block = data[first : first + sensors_per_block]
+            block_flags = flags[first : first + sensors_per_block]
+            means = np.empty((len(block), replicates))
+            stds = np.empty_like(means)
+            ratios = np.empty_like(means)
+            for start in range(0, replicates, replicates_per_block):
+                stop = min(start + replicates_per_block, replicates)
+                index = rng.integers(0, size, size=(len(block), stop - start, size))
+                samples = np.take_along_axis(block[:, None, :], index, axis=2)
+                means[:, start:stop] = samples.mean(axis=2)
+                stds[:, start:stop] = samples.std(axis=2)
+                ratios[:, start:stop] = np.take_along_axis(block_flags[:, None, :], index, axis=2).mean(axis=2)
+            mean_bounds = np.quantile(means, quantiles, axis=1)
+            std_bounds = np.quantile(stds, quantiles, axis=1)
+            ratio_bounds = np.quantile(ratios, quantiles, axis=1)
+            for offset, sensor_id in enumerate(sensor_ids[first : first + sensors_per_block]):
+                results[sensor_id] = MetricIntervals(
+                    sensor_id=sensor_id,
+                    count=size,
+                    average_delta=(float(mean_bounds[0, offset]), float(mean_bounds[1, offset])),
+                    std_dev=(float(std_bounds[0, offset]), float(std_bounds[1, offset])),
+                    outlier_ratio=(float(ratio_bounds[0, offset]), float(ratio_bounds[1, offset])),
+                )
+    return [results[sensor_id] for sensor_id in deltas]
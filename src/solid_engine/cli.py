@@ -2,42 +2,128 @@
 
 from __future__ import annotations
 
-import csv
 import json
+import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, TypeVar
 
 import click
 
+from .bootstrap import bootstrap_intervals
+from .dedup import DEDUP_POLICIES, Deduplicator
+from .detection import DETECTORS, DriftDetector
 from .filters import filter_by_sensor_id, filter_by_time_range, filter_outliers
+from .ingest import (
+    RowQuarantine,
+    read_csv,
+    read_csv_parallel,
+    summarize_csv_parallel,
+    summarize_sensors_parallel,
+)
 from .metrics import ReliabilityMetrics
 from .models import ReadingBatch, SensorReading
-from .report import ReportBuilder
+from .report import SORT_KEYS, ReportBuilder, ReportLine
+from .rollup import RESOLUTIONS, RollupStore
 from .simulation import ScenarioSimulator
 
 DEFAULT_DATA_PATH = Path("data/sample_readings.csv")
 
+F = TypeVar("F", bound=Callable[..., None])
+
+
+def _load_csv(
+    path: Path, workers: int = 1, quarantine: RowQuarantine | None = None
+) -> Iterable[SensorReading]:
+    """Load sensor readings from CSV, in parallel chunks when ``workers > 1``."""
+    if workers > 1:
+        return read_csv_parallel(path, workers, quarantine=quarantine)
+    return read_csv(path, quarantine)
+
+
+def _make_quarantine(
+    tolerant: bool,
+    quarantine_path: Path | None,
+    max_errors: int | None,
+    max_error_ratio: float | None,
+) -> RowQuarantine | None:
+    """Build a quarantine if any tolerant-ingestion option was given."""
+    if not (tolerant or quarantine_path or max_errors is not None or max_error_ratio is not None):
+        return None
+    return RowQuarantine(path=quarantine_path, max_errors=max_errors, max_error_ratio=max_error_ratio)
+
+
+def _rejected_summary(quarantine: RowQuarantine) -> str:
+    stats = quarantine.stats
+    summary = f"Rejected {stats.rejected} of {stats.rows} rows"
+    if quarantine.path is not None and stats.rejected:
+        summary += f" (quarantined to {quarantine.path})"
+    return summary
 
-def _load_csv(path: Path) -> Iterable[SensorReading]:
-    """Load sensor readings from CSV file with error handling."""
-    if not path.exists():
-        raise FileNotFoundError(f"Data file not found: {path}")
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                try:
-                    yield SensorReading(
-                        sensor_id=row["sensor_id"],
-                        recorded_at=datetime.fromisoformat(row["recorded_at"]),
-                        value=float(row["value"]),
-                        expected=float(row["expected"]),
-                    )
-                except (KeyError, ValueError, TypeError) as e:
-                    raise ValueError(f"Invalid data at row {row_num}: {e}") from e
-    except IOError as e:
-        raise IOError(f"Failed to read file {path}: {e}") from e
+
+def _tolerance_options(func: F) -> F:
+    """Attach the tolerant-ingestion options to a command."""
+    options = [
+        click.option(
+            "--tolerant",
+            is_flag=True,
+            help="Skip malformed rows instead of stopping at the first one.",
+        ),
+        click.option(
+            "--quarantine",
+            "quarantine_path",
+            type=click.Path(path_type=Path),
+            help="Write skipped rows with row number and reason to this CSV (implies --tolerant).",
+        ),
+        click.option(
+            "--max-errors",
+            type=click.IntRange(min=0),
+            help="Fail once more than this many rows are skipped (implies --tolerant).",
+        ),
+        click.option(
+            "--max-error-ratio",
+            type=click.FloatRange(0, 1),
+            help="Fail if more than this share of rows is skipped (implies --tolerant).",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def _deduplicate(
+    readings: Iterable[SensorReading], policy: str | None, unordered: bool
+) -> list[SensorReading]:
+    """Apply the requested dedup policy and report what was dropped."""
+    if policy is None:
+        return list(readings)
+    deduplicator = Deduplicator(policy=policy, ordered=not unordered)
+    result = list(deduplicator.process(readings))
+    stats = deduplicator.stats
+    click.echo(
+        f"Dropped {stats.duplicates} duplicate readings "
+        f"({stats.late} arrived out of order)",
+        err=True,
+    )
+    return result
+
+
+_dedup_option = click.option(
+    "--dedup",
+    type=click.Choice(DEDUP_POLICIES),
+    help="Drop repeated (sensor_id, recorded_at) readings, keeping first, last or average.",
+)
+_unordered_option = click.option(
+    "--unordered",
+    is_flag=True,
+    help="Input is not time-ordered per sensor; remember every key instead of a watermark.",
+)
+_workers_option = click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Parse the CSV in newline-aligned chunks across this many processes.",
+)
 
 
 @click.group()
@@ -49,17 +135,104 @@ def main() -> None:
 @click.option("--data", "data_path", type=click.Path(path_type=Path), default=DEFAULT_DATA_PATH)
 @click.option("--json/--text", "as_json", default=False, help="Return JSON instead of plain text.")
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output with additional details.")
-def report(data_path: Path, as_json: bool, verbose: bool) -> None:
+@_dedup_option
+@_unordered_option
+@click.option(
+    "--rollups",
+    "rollup_dir",
+    type=click.Path(path_type=Path),
+    help="Answer from rollup tables built by the rollup command (per-sensor lines).",
+)
+@click.option("--start-time", help="Range start for --rollups (ISO format, inclusive)")
+@click.option("--end-time", help="Range end for --rollups (ISO format, exclusive)")
+@_workers_option
+@click.option(
+    "--top", type=click.IntRange(min=1), help="Only show the K worst sensors (per-sensor lines)."
+)
+@click.option(
+    "--sort-by",
+    type=click.Choice(SORT_KEYS),
+    default="outlier_ratio",
+    show_default=True,
+    help="Metric used to rank sensors for --top.",
+)
+@click.option(
+    "--style",
+    type=click.Choice(["table", "compact", "detailed"]),
+    default="table",
+    help="Text layout.",
+)
+@click.option("--page-size", type=click.IntRange(min=1), help="Print text output in pages of N lines.")
+@_tolerance_options
+def report(
+    data_path: Path,
+    as_json: bool,
+    verbose: bool,
+    dedup: str | None,
+    unordered: bool,
+    rollup_dir: Path | None,
+    start_time: str | None,
+    end_time: str | None,
+    workers: int,
+    top: int | None,
+    sort_by: str,
+    style: str,
+    page_size: int | None,
+    tolerant: bool,
+    quarantine_path: Path | None,
+    max_errors: int | None,
+    max_error_ratio: float | None,
+) -> None:
     """Generate a text report from CSV input."""
 
-    if verbose:
-        click.echo(f"Loading data from: {data_path}", err=True)
-    readings = list(_load_csv(data_path))
-    if verbose:
-        click.echo(f"Loaded {len(readings)} readings", err=True)
-    batch = ReadingBatch.from_iterable(source=data_path.name, iterable=readings)
+    # Rollup reports never read the raw file, so there is nothing to quarantine.
+    quarantine = None
+    if rollup_dir is None:
+        quarantine = _make_quarantine(tolerant, quarantine_path, max_errors, max_error_ratio)
     builder = ReportBuilder()
-    rows = builder.build([batch])
+    if rollup_dir is not None:
+        store = RollupStore.load(rollup_dir)
+        span = store.span()
+        if span is None:
+            raise click.ClickException(f"Rollup tables in {rollup_dir} are empty")
+        # Unaligned bounds are widened to whole buckets rather than read from raw data.
+        start, end = store.align(
+            datetime.fromisoformat(start_time) if start_time else span[0],
+            datetime.fromisoformat(end_time) if end_time else span[1],
+        )
+        if verbose:
+            click.echo(f"Reading rollups from {rollup_dir} for {start} to {end} UTC", err=True)
+        rows = builder.build_range(store, start, end)
+    elif top is not None:
+        if verbose:
+            click.echo(f"Ranking sensors in {data_path} by {sort_by}", err=True)
+        if workers > 1 and dedup is None:
+            # Workers send back per-sensor accumulators rather than readings.
+            per_sensor = summarize_sensors_parallel(data_path, workers, quarantine=quarantine)
+            rows = [ReportLine.from_metrics(sensor_id, metrics) for sensor_id, metrics in per_sensor.items()]
+        else:
+            readings = _load_csv(data_path, workers, quarantine)
+            if dedup is not None:
+                readings = _deduplicate(readings, dedup, unordered)
+            rows = builder.iter_sensor_lines(readings)
+    elif workers > 1 and dedup is None:
+        if verbose:
+            click.echo(f"Summarising {data_path} with {workers} workers", err=True)
+        # Workers send back per-chunk accumulators, so no readings cross processes.
+        metrics = summarize_csv_parallel(data_path, workers, quarantine=quarantine)
+        if verbose:
+            click.echo(f"Loaded {metrics.count} readings", err=True)
+        rows = [ReportLine.from_metrics(data_path.name, metrics)]
+    else:
+        if verbose:
+            click.echo(f"Loading data from: {data_path}", err=True)
+        readings = _deduplicate(_load_csv(data_path, workers, quarantine), dedup, unordered)
+        if verbose:
+            click.echo(f"Loaded {len(readings)} readings", err=True)
+        batch = ReadingBatch.from_iterable(source=data_path.name, iterable=readings)
+        rows = builder.build([batch])
+    if top is not None:
+        rows = builder.rank(rows, top, sort_by)
     if as_json:
         payload = [
             {
@@ -68,12 +241,119 @@ def report(data_path: Path, as_json: bool, verbose: bool) -> None:
                 "average_delta": row.average_delta,
                 "std_dev": row.std_dev,
                 "outlier_ratio": row.outlier_ratio,
+                "max_delta": row.max_delta,
             }
             for row in rows
         ]
         click.echo(json.dumps(payload, indent=2))
+        if quarantine is not None:
+            click.echo(_rejected_summary(quarantine), err=True)
+        return
+    if page_size is not None:
+        for page in builder.iter_render(rows, style, page_size):
+            click.echo(page)
     else:
-        click.echo(builder.format([batch]))
+        click.echo(builder.render(rows, style))
+    if quarantine is not None:
+        click.echo(_rejected_summary(quarantine))
+
+
+@main.command()
+@click.option("--data", "data_path", type=click.Path(path_type=Path), default=DEFAULT_DATA_PATH)
+@click.option("--output", "output_dir", type=click.Path(path_type=Path), required=True)
+@click.option(
+    "--resolution",
+    "resolutions",
+    type=click.Choice(tuple(RESOLUTIONS)),
+    multiple=True,
+    help="Bucket resolution to keep; repeat to combine. Defaults to all.",
+)
+@click.option("--outlier-threshold", type=float, default=5.0)
+@click.option(
+    "--append",
+    is_flag=True,
+    help="Add the readings to the store already in --output instead of starting a new one.",
+)
+def rollup(
+    data_path: Path,
+    output_dir: Path,
+    resolutions: tuple[str, ...],
+    outlier_threshold: float,
+    append: bool,
+) -> None:
+    """Aggregate readings into per-sensor rollup buckets on disk."""
+
+    exists = (output_dir / "rollup.json").exists()
+    if append and exists:
+        store = RollupStore.load(output_dir)
+        if store.outlier_threshold != outlier_threshold:
+            raise click.ClickException(
+                f"{output_dir} was built with --outlier-threshold {store.outlier_threshold}"
+            )
+        if resolutions and set(resolutions) != set(store.resolutions):
+            raise click.ClickException(
+                f"{output_dir} keeps {', '.join(store.resolutions)} rollups"
+            )
+    elif exists:
+        raise click.ClickException(f"{output_dir} already holds rollups; pass --append to add to them")
+    else:
+        # A store bound to its directory flushes finished periods as it goes;
+        # rollup.json is only written once the whole file has been added.
+        store = RollupStore(
+            outlier_threshold=outlier_threshold,
+            resolutions=resolutions or tuple(RESOLUTIONS),
+            directory=output_dir,
+        )
+    try:
+        store.extend(_load_csv(data_path))
+    except BaseException:
+        if not exists:
+            for resolution in store.resolutions:
+                shutil.rmtree(output_dir / resolution, ignore_errors=True)
+        raise
+    store.save()
+    click.echo(f"Wrote {', '.join(store.resolutions)} rollups to {output_dir}")
+
+
+@main.command()
+@click.option("--data", "data_path", type=click.Path(path_type=Path), default=DEFAULT_DATA_PATH)
+@click.option(
+    "--detector",
+    "detectors",
+    type=click.Choice(DETECTORS),
+    multiple=True,
+    help="Detector to run; repeat to combine. Defaults to all.",
+)
+@click.option("--json/--text", "as_json", default=False, help="Return JSON instead of plain text.")
+def detect(data_path: Path, detectors: tuple[str, ...], as_json: bool) -> None:
+    """Stream readings through per-sensor drift and anomaly detectors."""
+
+    detector = DriftDetector(detectors=detectors or DETECTORS)
+    events = list(detector.process(_load_csv(data_path)))
+    builder = ReportBuilder()
+    drift = builder.drift_lines(detector)
+    if as_json:
+        payload = {
+            "events": [event.to_dict() for event in events],
+            "drift": [
+                {
+                    "sensor_id": line.sensor_id,
+                    "count": line.count,
+                    "drift_slope": line.drift_slope,
+                    "ewma": line.ewma,
+                    "anomalies": line.anomalies,
+                }
+                for line in drift
+            ],
+        }
+        click.echo(json.dumps(payload, indent=2))
+    else:
+        for event in events:
+            click.echo(
+                f"{event.recorded_at.isoformat()} {event.sensor_id} "
+                f"{event.detector} score={event.score:+.3f} delta={event.delta:+.3f}"
+            )
+        click.echo(builder.format_drift(drift))
 
 
 @main.command()
@@ -81,13 +361,84 @@ def report(data_path: Path, as_json: bool, verbose: bool) -> None:
 @click.option("--expected", type=float, default=10.0)
 @click.option("--count", type=int, default=5)
 @click.option("--seed", type=int, default=42)
-def simulate(sensor: str, expected: float, count: int, seed: int) -> None:
+@click.option(
+    "--replicates",
+    type=click.IntRange(min=1),
+    help="Run this many seeded replicates per parameter combination.",
+)
+@click.option("--jitter", "jitters", type=float, multiple=True, help="Replicate jitter; repeatable.")
+@click.option(
+    "--noise-type",
+    "noise_types",
+    type=click.Choice(["uniform", "gaussian"]),
+    multiple=True,
+    help="Replicate noise type; repeatable.",
+)
+@click.option("--drift-rate", "drift_rates", type=float, multiple=True, help="Replicate drift; repeatable.")
+@click.option("--workers", type=click.IntRange(min=1), help="Processes used for replicates.")
+def simulate(
+    sensor: str,
+    expected: float,
+    count: int,
+    seed: int,
+    replicates: int | None,
+    jitters: tuple[float, ...],
+    noise_types: tuple[str, ...],
+    drift_rates: tuple[float, ...],
+    workers: int | None,
+) -> None:
     """Generate synthetic readings and print summary metrics."""
 
     simulator = ScenarioSimulator(seed=seed)
-    batch = simulator.generate(sensor_id=sensor, expected_value=expected, count=count)
-    metrics = ReliabilityMetrics.from_readings(batch.readings)
-    click.echo(metrics.to_dict())
+    if replicates is None:
+        batch = simulator.generate(sensor_id=sensor, expected_value=expected, count=count)
+        metrics = ReliabilityMetrics.from_readings(batch.readings)
+        click.echo(metrics.to_dict())
+        return
+    results = simulator.replicate(
+        sensor,
+        expected,
+        replicates=replicates,
+        count=count,
+        jitters=jitters or None,
+        noise_types=noise_types or None,
+        drift_rates=drift_rates or (0.0,),
+        workers=workers,
+    )
+    for result in results:
+        click.echo(
+            {
+                "jitter": result.jitter,
+                "noise_type": result.noise_type,
+                "drift_rate": result.drift_rate,
+                "seed": result.seed,
+                **result.metrics.to_dict(),
+            }
+        )
+
+
+@main.command()
+@click.option("--data", "data_path", type=click.Path(path_type=Path), default=DEFAULT_DATA_PATH)
+@click.option("--replicates", type=click.IntRange(min=1), default=1000, show_default=True)
+@click.option("--confidence", type=click.FloatRange(0, 1, min_open=True, max_open=True), default=0.95)
+@click.option("--seed", type=int, default=42)
+@click.option("--json/--text", "as_json", default=False, help="Return JSON instead of plain text.")
+def intervals(data_path: Path, replicates: int, confidence: float, seed: int, as_json: bool) -> None:
+    """Print per-sensor bootstrap confidence intervals."""
+
+    results = bootstrap_intervals(
+        _load_csv(data_path), replicates=replicates, confidence=confidence, seed=seed
+    )
+    if as_json:
+        click.echo(json.dumps([result.to_dict() for result in results], indent=2))
+        return
+    for result in results:
+        click.echo(
+            f"{result.sensor_id:>12} | count={result.count:3d} "
+            f"avg=[{result.average_delta[0]:+.3f}, {result.average_delta[1]:+.3f}] "
+            f"std=[{result.std_dev[0]:.3f}, {result.std_dev[1]:.3f}] "
+            f"outliers=[{result.outlier_ratio[0]:.2%}, {result.outlier_ratio[1]:.2%}]"
+        )
 
 
 @main.command()
@@ -97,6 +448,10 @@ def simulate(sensor: str, expected: float, count: int, seed: int) -> None:
 @click.option("--start-time", help="Start time (ISO format)")
 @click.option("--end-time", help="End time (ISO format)")
 @click.option("--output", type=click.Path(path_type=Path), help="Output file path")
+@_dedup_option
+@_unordered_option
+@_workers_option
+@_tolerance_options
 def filter_data(
     data_path: Path,
     sensor_id: str | None,
@@ -104,9 +459,19 @@ def filter_data(
     start_time: str | None,
     end_time: str | None,
     output: Path | None,
+    dedup: str | None,
+    unordered: bool,
+    workers: int,
+    tolerant: bool,
+    quarantine_path: Path | None,
+    max_errors: int | None,
+    max_error_ratio: float | None,
 ) -> None:
     """Filter sensor readings by various criteria."""
-    readings = list(_load_csv(data_path))
+    quarantine = _make_quarantine(tolerant, quarantine_path, max_errors, max_error_ratio)
+    readings = _deduplicate(_load_csv(data_path, workers, quarantine), dedup, unordered)
+    if quarantine is not None:
+        click.echo(_rejected_summary(quarantine), err=True)
     
     if sensor_id:
         readings = filter_by_sensor_id(readings, sensor_id)
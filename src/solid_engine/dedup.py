@@ -0,0 +1,237 @@
+"""Ingestion-time deduplication of retransmitted readings."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from .models import SensorReading
+
+DEDUP_POLICIES = ("first", "last", "average")
+
+
+@dataclass
+class DedupStats:
+    """Counters collected while deduplicating a stream."""
+
+    total: int = 0
+    duplicates: int = 0
+    late: int = 0
+
+    @property
+    def emitted(self) -> int:
+        """Number of readings that survived deduplication."""
+        return self.total - self.duplicates
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert stats to dictionary format."""
+        return {
+            "total": self.total,
+            "duplicates": self.duplicates,
+            "late": self.late,
+            "emitted": self.emitted,
+        }
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set used for unordered first-wins dedup."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(bits, 8)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, key: str) -> bool:
+        """Add a key and return True if it was (probably) already present."""
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                present = False
+                self._bits[byte] |= 1 << bit
+        return present
+
+
+@dataclass
+class _Group:
+    """Readings sharing one ``(sensor_id, recorded_at)`` key."""
+
+    reading: SensorReading
+    value_sum: float
+    expected_sum: float
+    size: int = 1
+
+    def merge(self, reading: SensorReading, policy: str) -> None:
+        self.size += 1
+        self.value_sum += reading.value
+        self.expected_sum += reading.expected
+        if policy == "last":
+            self.reading = reading
+
+    def resolve(self, policy: str) -> SensorReading:
+        if policy != "average" or self.size == 1:
+            return self.reading
+        return SensorReading(
+            sensor_id=self.reading.sensor_id,
+            recorded_at=self.reading.recorded_at,
+            value=self.value_sum / self.size,
+            expected=self.expected_sum / self.size,
+        )
+
+
+class _RecentKeys:
+    """Bounded set of the most recently emitted timestamps for one sensor."""
+
+    def __init__(self, size: int) -> None:
+        self._order: deque[datetime] = deque()
+        self._keys: set[datetime] = set()
+        self._size = size
+
+    def __contains__(self, key: datetime) -> bool:
+        return key in self._keys
+
+    def add(self, key: datetime) -> None:
+        if self._size == 0 or key in self._keys:
+            return
+        self._order.append(key)
+        self._keys.add(key)
+        if len(self._order) > self._size:
+            self._keys.discard(self._order.popleft())
+
+
+@dataclass
+class Deduplicator:
+    """
+    Drop repeated ``(sensor_id, recorded_at)`` readings from a stream.
+
+    With ``ordered=True`` the input is assumed to be mostly time-ordered per
+    sensor. Each sensor keeps one pending group plus its last ``window``
+    emitted timestamps, so memory is bounded by the number of sensors.
+    Readings older than the pending group are counted as late: they are
+    dropped only if they repeat a remembered timestamp (keeping the reading
+    already emitted, whatever the policy) and passed through otherwise.
+
+    With ``ordered=False`` every key seen is remembered. For the ``first``
+    policy a Bloom filter of ``bloom_capacity`` keys can replace the exact
+    set, trading a small false-positive rate for fixed memory.
+
+    Attributes:
+        policy: Which duplicate to keep ("first", "last" or "average")
+        ordered: Whether input is time-ordered per sensor
+        window: Emitted timestamps remembered per sensor in ordered mode
+        bloom_capacity: Expected key count for the Bloom filter fallback
+        stats: Counters for the most recent :meth:`process` call
+    """
+
+    policy: str = "first"
+    ordered: bool = True
+    window: int = 64
+    bloom_capacity: int | None = None
+    stats: DedupStats = field(default_factory=DedupStats)
+
+    def __post_init__(self) -> None:
+        if self.policy not in DEDUP_POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(DEDUP_POLICIES)}")
+        if self.window < 0:
+            raise ValueError("window must be non-negative")
+        if self.bloom_capacity is not None:
+            if self.ordered:
+                raise ValueError("bloom_capacity only applies to unordered input")
+            if self.policy != "first":
+                raise ValueError("bloom_capacity requires the 'first' policy")
+
+    def process(self, readings: Iterable[SensorReading]) -> Iterator[SensorReading]:
+        """Yield deduplicated readings, updating :attr:`stats` as it goes."""
+        self.stats = DedupStats()
+        if self.ordered:
+            return self._process_ordered(readings)
+        if self.policy == "first":
+            return self._process_first_seen(readings)
+        return self._process_grouped(readings)
+
+    def _process_ordered(self, readings: Iterable[SensorReading]) -> Iterator[SensorReading]:
+        pending: dict[str, _Group] = {}
+        recent: dict[str, _RecentKeys] = {}
+        for reading in readings:
+            self.stats.total += 1
+            sensor_id = reading.sensor_id
+            group = pending.get(sensor_id)
+            if group is None:
+                pending[sensor_id] = _Group(reading, reading.value, reading.expected)
+                continue
+            watermark = group.reading.recorded_at
+            if reading.recorded_at == watermark:
+                self.stats.duplicates += 1
+                group.merge(reading, self.policy)
+                continue
+            keys = recent.get(sensor_id)
+            if keys is None:
+                keys = recent[sensor_id] = _RecentKeys(self.window)
+            if reading.recorded_at < watermark:
+                self.stats.late += 1
+                if reading.recorded_at in keys:
+                    self.stats.duplicates += 1
+                else:
+                    keys.add(reading.recorded_at)
+                    yield reading
+            else:
+                yield group.resolve(self.policy)
+                keys.add(watermark)
+                pending[sensor_id] = _Group(reading, reading.value, reading.expected)
+        for group in pending.values():
+            yield group.resolve(self.policy)
+
+    def _process_first_seen(self, readings: Iterable[SensorReading]) -> Iterator[SensorReading]:
+        bloom = BloomFilter(self.bloom_capacity) if self.bloom_capacity is not None else None
+        seen: set[tuple[str, datetime]] = set()
+        for reading in readings:
+            self.stats.total += 1
+            if bloom is not None:
+                duplicate = bloom.add(f"{reading.sensor_id}\x00{reading.recorded_at.isoformat()}")
+            else:
+                key = (reading.sensor_id, reading.recorded_at)
+                duplicate = key in seen
+                seen.add(key)
+            if duplicate:
+                self.stats.duplicates += 1
+            else:
+                yield reading
+
+    def _process_grouped(self, readings: Iterable[SensorReading]) -> Iterator[SensorReading]:
+        groups: dict[tuple[str, datetime], _Group] = {}
+        for reading in readings:
+            self.stats.total += 1
+            key = (reading.sensor_id, reading.recorded_at)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = _Group(reading, reading.value, reading.expected)
+            else:
+                self.stats.duplicates += 1
+                group.merge(reading, self.policy)
+        for group in groups.values():
+            yield group.resolve(self.policy)
+
+
+def deduplicate(
+    readings: Iterable[SensorReading], policy: str = "first", *, ordered: bool = True
+) -> tuple[list[SensorReading], DedupStats]:
+    """Deduplicate readings eagerly and return them with the collected stats."""
+    deduplicator = Deduplicator(policy=policy, ordered=ordered)
+    result = list(deduplicator.process(readings))
+    return result, deduplicator.stats
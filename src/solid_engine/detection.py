@@ -0,0 +1,231 @@
+"""Streaming per-sensor drift and anomaly detection."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from .models import SensorReading
+
+DETECTORS = ("ewma", "cusum", "zscore")
+
+
+@dataclass(frozen=True)
+class AnomalyEvent:
+    """A single detector firing on a reading."""
+
+    sensor_id: str
+    recorded_at: datetime
+    detector: str
+    score: float
+    delta: float
+
+    def to_dict(self) -> dict[str, str | float]:
+        """Convert event to dictionary format."""
+        return {
+            "sensor_id": self.sensor_id,
+            "recorded_at": self.recorded_at.isoformat(),
+            "detector": self.detector,
+            "score": round(self.score, 4),
+            "delta": round(self.delta, 4),
+        }
+
+
+@dataclass
+class EwmaDetector:
+    """
+    Exponentially weighted moving average of delta against a fixed limit.
+
+    Fires once when the average crosses the limit, then stays quiet until it
+    falls back below ``rearm`` times the limit, so a sustained offset raises
+    one event rather than one per reading.
+    """
+
+    alpha: float = 0.3
+    limit: float = 1.0
+    rearm: float = 0.5
+    value: float = 0.0
+    armed: bool = True
+
+    def update(self, delta: float) -> float | None:
+        self.value = self.alpha * delta + (1 - self.alpha) * self.value
+        if not self.armed:
+            self.armed = abs(self.value) < self.limit * self.rearm
+            return None
+        if abs(self.value) >= self.limit:
+            self.armed = False
+            return self.value
+        return None
+
+
+@dataclass
+class CusumDetector:
+    """Two-sided CUSUM on delta; resets after an alarm."""
+
+    slack: float = 0.5
+    limit: float = 5.0
+    high: float = 0.0
+    low: float = 0.0
+
+    def update(self, delta: float) -> float | None:
+        self.high = max(0.0, self.high + delta - self.slack)
+        self.low = max(0.0, self.low - delta - self.slack)
+        if self.high >= self.limit:
+            score, self.high = self.high, 0.0
+            return score
+        if self.low >= self.limit:
+            score, self.low = -self.low, 0.0
+            return score
+        return None
+
+
+@dataclass
+class ZScoreDetector:
+    """Z-score of delta against a fixed-size rolling window."""
+
+    window: int = 30
+    limit: float = 4.0
+    _values: deque[float] = field(default_factory=deque, init=False, repr=False)
+    _sum: float = field(default=0.0, init=False, repr=False)
+    _sum_sq: float = field(default=0.0, init=False, repr=False)
+
+    def update(self, delta: float) -> float | None:
+        score = None
+        size = len(self._values)
+        if size >= max(2, self.window // 2):
+            mean = self._sum / size
+            variance = max(self._sum_sq / size - mean * mean, 0.0)
+            if variance > 0:
+                z = (delta - mean) / math.sqrt(variance)
+                if abs(z) >= self.limit:
+                    score = z
+        self._values.append(delta)
+        self._sum += delta
+        self._sum_sq += delta * delta
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+        return score
+
+
+@dataclass
+class DriftSlope:
+    """Online least-squares slope of delta per reading."""
+
+    count: int = 0
+    sum_x: float = 0.0
+    sum_y: float = 0.0
+    sum_xx: float = 0.0
+    sum_xy: float = 0.0
+
+    def update(self, delta: float) -> None:
+        x = float(self.count)
+        self.count += 1
+        self.sum_x += x
+        self.sum_y += delta
+        self.sum_xx += x * x
+        self.sum_xy += x * delta
+
+    @property
+    def slope(self) -> float:
+        denominator = self.count * self.sum_xx - self.sum_x * self.sum_x
+        if self.count < 2 or denominator == 0:
+            return 0.0
+        return (self.count * self.sum_xy - self.sum_x * self.sum_y) / denominator
+
+
+@dataclass
+class SensorDriftState:
+    """Constant-size detector state kept for one sensor."""
+
+    sensor_id: str
+    ewma: EwmaDetector
+    cusum: CusumDetector
+    zscore: ZScoreDetector
+    drift: DriftSlope = field(default_factory=DriftSlope)
+    anomalies: int = 0
+
+    @property
+    def count(self) -> int:
+        return self.drift.count
+
+
+@dataclass
+class DriftDetector:
+    """
+    Run EWMA, CUSUM and rolling z-score detectors per sensor in one pass.
+
+    Each sensor holds a fixed amount of state regardless of stream length, so
+    thousands of interleaved sensors can be scanned without grouping first.
+    The drift slope is the least-squares trend of delta per reading, matching
+    the ``drift_rate`` used by :class:`ScenarioSimulator`.
+
+    Attributes:
+        detectors: Which detectors raise events (subset of ``DETECTORS``)
+        ewma_alpha: Smoothing factor for the EWMA detector
+        ewma_limit: Absolute EWMA value that raises an event
+        cusum_slack: Per-reading allowance subtracted by CUSUM
+        cusum_limit: Cumulative sum that raises an event
+        zscore_window: Rolling window size for the z-score detector
+        zscore_limit: Absolute z-score that raises an event
+    """
+
+    detectors: tuple[str, ...] = DETECTORS
+    ewma_alpha: float = 0.3
+    ewma_limit: float = 1.0
+    cusum_slack: float = 0.5
+    cusum_limit: float = 5.0
+    zscore_window: int = 30
+    zscore_limit: float = 4.0
+    states: dict[str, SensorDriftState] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        unknown = set(self.detectors) - set(DETECTORS)
+        if unknown:
+            raise ValueError(f"Unknown detectors: {', '.join(sorted(unknown))}")
+        if not 0 < self.ewma_alpha <= 1:
+            raise ValueError("ewma_alpha must be in (0, 1]")
+        if self.zscore_window < 2:
+            raise ValueError("zscore_window must be at least 2")
+
+    def _state(self, sensor_id: str) -> SensorDriftState:
+        state = self.states.get(sensor_id)
+        if state is None:
+            state = SensorDriftState(
+                sensor_id=sensor_id,
+                ewma=EwmaDetector(alpha=self.ewma_alpha, limit=self.ewma_limit),
+                cusum=CusumDetector(slack=self.cusum_slack, limit=self.cusum_limit),
+                zscore=ZScoreDetector(window=self.zscore_window, limit=self.zscore_limit),
+            )
+            self.states[sensor_id] = state
+        return state
+
+    def update(self, reading: SensorReading) -> list[AnomalyEvent]:
+        """Feed one reading and return any events it triggers."""
+        state = self._state(reading.sensor_id)
+        delta = reading.delta
+        state.drift.update(delta)
+        events = []
+        for name in self.detectors:
+            score = getattr(state, name).update(delta)
+            if score is not None:
+                events.append(
+                    AnomalyEvent(
+                        sensor_id=reading.sensor_id,
+                        recorded_at=reading.recorded_at,
+                        detector=name,
+                        score=score,
+                        delta=delta,
+                    )
+                )
+        state.anomalies += len(events)
+        return events
+
+    def process(self, readings: Iterable[SensorReading]) -> Iterator[AnomalyEvent]:
+        """Feed a stream of readings and yield events as they are raised."""
+        for reading in readings:
+            yield from self.update(reading)
@@ -0,0 +1,632 @@
+"""CSV ingestion, including compressed input and parallel parsing."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, TextIO, TypeVar
+
+from .metrics import ReliabilityMetrics
+from .models import ReadingBatch, SensorReading
+from .rollup import RollupBucket
+from .shared import SharedBatchHandle, SharedColumns, worker_pool
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Truncated or corrupt compressed input surfaces as one of these while reading.
+_READ_ERRORS: tuple[type[Exception], ...] = (OSError, EOFError)
+if ZSTD_AVAILABLE:
+    _READ_ERRORS += (zstandard.ZstdError,)
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+BLOCK_ROWS = 10_000
+READ_AHEAD_BLOCK_BYTES = 1024 * 1024
+READ_AHEAD_BLOCKS = 8
+
+_MAGIC = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+
+
+def detect_compression(path: Path) -> str | None:
+    """Return "gzip" or "zstd" based on the file's magic bytes, else None."""
+    with path.open("rb") as handle:
+        head = handle.read(4)
+    for magic, name in _MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+class _ReadAheadStream(io.RawIOBase):
+    """
+    Read a binary stream on a background thread into a bounded queue.
+
+    File reads and decompression happen on the producer thread while the
+    consumer parses earlier blocks. At most ``max_blocks`` blocks are buffered.
+    Errors raised by the producer are re-raised to the consumer.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO | _ZstdReader,
+        block_size: int = READ_AHEAD_BLOCK_BYTES,
+        max_blocks: int = READ_AHEAD_BLOCKS,
+    ) -> None:
+        super().__init__()
+        self._source = source
+        self._block_size = block_size
+        self._queue: queue.Queue[bytes | BaseException] = queue.Queue(maxsize=max_blocks)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._produce, name="solid-engine-read-ahead", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: bytes | BaseException) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _produce(self) -> None:
+        try:
+            while not self._stop.is_set():
+                block = self._source.read(self._block_size)
+                self._put(block)
+                if not block:
+                    return
+        except BaseException as e:  # handed to the consumer thread
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        if not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+class _ZstdReader:
+    """Decompress zstd frames block by block, raising ``EOFError`` on a truncated frame."""
+
+    def __init__(self, source: BinaryIO) -> None:
+        self._source = source
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._frame = self._decompressor.decompressobj()
+        self._in_frame = False
+
+    def read(self, size: int) -> bytes:
+        while True:
+            data = self._source.read(size)
+            if not data:
+                if self._in_frame:
+                    raise EOFError("Compressed file ended before the end of the zstd frame")
+                return b""
+            output = []
+            while data:
+                if self._frame.eof:
+                    self._frame = self._decompressor.decompressobj()
+                output.append(self._frame.decompress(data))
+                self._in_frame = not self._frame.eof
+                data = self._frame.unused_data if self._frame.eof else b""
+            if any(output):
+                return b"".join(output)
+
+    def close(self) -> None:
+        self._source.close()
+
+
+def open_text(path: Path) -> TextIO:
+    """
+    Open a CSV for reading, transparently decompressing gzip or zstd input.
+
+    Compressed files are read and decompressed on a background thread with a
+    bounded read-ahead buffer so that decompression overlaps with parsing.
+    """
+    compression = detect_compression(path)
+    if compression is None:
+        return path.open("r", encoding="utf-8")
+    if compression == "gzip":
+        source: BinaryIO | _ZstdReader = gzip.open(path, "rb")
+    else:
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is required to read zstd-compressed input")
+        source = _ZstdReader(path.open("rb"))
+    return io.TextIOWrapper(io.BufferedReader(_ReadAheadStream(source)), encoding="utf-8")
+
+
+_COLUMNS = ("sensor_id", "recorded_at", "value", "expected")
+
+
+def _convert(column: list[str | None], convert: Callable[[str], T], errors: dict[int, Exception]) -> list[T | None]:
+    """Convert a whole column at once, going value by value only to locate failures."""
+    try:
+        return list(map(convert, column))
+    except (TypeError, ValueError):
+        pass
+    converted: list[T | None] = []
+    for index, text in enumerate(column):
+        try:
+            converted.append(convert(text))
+        except (TypeError, ValueError) as e:
+            errors.setdefault(index, e)
+            converted.append(None)
+    return converted
+
+
+def check_columns(fieldnames: list[str], path: Path | None = None) -> None:
+    """Raise ``ValueError`` if the header lacks a required column."""
+    missing = [name for name in _COLUMNS if name not in fieldnames]
+    if missing:
+        where = f" in {path}" if path is not None else ""
+        raise ValueError(f"Missing required columns{where}: {', '.join(missing)}")
+
+
+def parse_records(
+    fieldnames: list[str], records: list[list[str]]
+) -> tuple[list[SensorReading], dict[int, Exception]]:
+    """
+    Validate a block of CSV records column by column.
+
+    Returns the readings built from the rows that passed, in order, and the
+    first failure of every rejected row keyed by its index in ``records``.
+    """
+    check_columns(fieldnames)
+    columns = {}
+    for name in _COLUMNS:
+        position = fieldnames.index(name)
+        columns[name] = [record[position] if position < len(record) else None for record in records]
+    errors: dict[int, Exception] = {}
+    recorded_at = _convert(columns["recorded_at"], datetime.fromisoformat, errors)
+    values = _convert(columns["value"], float, errors)
+    expected = _convert(columns["expected"], float, errors)
+    for index, sensor_id in enumerate(columns["sensor_id"]):
+        if not sensor_id:
+            errors.setdefault(index, ValueError("sensor_id cannot be empty"))
+    rows = zip(columns["sensor_id"], recorded_at, values, expected)
+    if not errors:
+        return [SensorReading(*row) for row in rows], errors
+    return [SensorReading(*row) for index, row in enumerate(rows) if index not in errors], errors
+
+
+def _blocks(records: Iterable[list[str]], size: int = BLOCK_ROWS) -> Iterator[list[list[str]]]:
+    block: list[list[str]] = []
+    for record in records:
+        if not record:
+            # csv.DictReader skips blank lines without numbering them.
+            continue
+        block.append(record)
+        if len(block) == size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _reason(error: Exception) -> str:
+    if isinstance(error, KeyError):
+        return f"missing column {error}"
+    return f"{type(error).__name__}: {error}"
+
+
+@dataclass
+class IngestStats:
+    """Row counts collected by a tolerant load."""
+
+    rows: int = 0
+    rejected: int = 0
+
+    @property
+    def accepted(self) -> int:
+        return self.rows - self.rejected
+
+    @property
+    def rejected_ratio(self) -> float:
+        return self.rejected / self.rows if self.rows else 0.0
+
+    def to_dict(self) -> dict[str, int | float]:
+        """Convert stats to dictionary format."""
+        return {
+            "rows": self.rows,
+            "rejected": self.rejected,
+            "accepted": self.accepted,
+            "rejected_ratio": round(self.rejected_ratio, 4),
+        }
+
+
+@dataclass
+class RowQuarantine:
+    """
+    Collect malformed rows instead of aborting a load.
+
+    Rejected rows are appended to ``path`` (when given) with their row number
+    and the reason they failed. The load still fails once more than
+    ``max_errors`` rows are rejected, or once the rejected share exceeds
+    ``max_error_ratio``. The share is checked as rows are rejected once
+    ``min_ratio_rows`` rows have been read, and again when the file is
+    finished.
+
+    Attributes:
+        path: CSV file receiving rejected rows, or None to only count them
+        max_errors: Largest number of rejected rows tolerated
+        max_error_ratio: Largest rejected share of all rows tolerated
+        min_ratio_rows: Rows read before the share is checked mid-load
+        stats: Counters for the load
+    """
+
+    path: Path | None = None
+    max_errors: int | None = None
+    max_error_ratio: float | None = None
+    min_ratio_rows: int = 1000
+    stats: IngestStats = field(default_factory=IngestStats)
+    _handle: TextIO | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_errors is not None and self.max_errors < 0:
+            raise ValueError("max_errors must be non-negative")
+        if self.max_error_ratio is not None and not 0 <= self.max_error_ratio <= 1:
+            raise ValueError("max_error_ratio must be between 0 and 1")
+        if self.min_ratio_rows < 0:
+            raise ValueError("min_ratio_rows must be non-negative")
+
+    def open(self, fieldnames: list[str]) -> None:
+        """Start a load; creates the quarantine file with a header row."""
+        self.stats = IngestStats()
+        if self.path is not None:
+            self._handle = self.path.open("w", newline="", encoding="utf-8")
+            csv.writer(self._handle).writerow(["row", "reason", *fieldnames])
+
+    def reject(self, row_num: int, reason: str, record: list[str]) -> None:
+        """Quarantine one row, failing if an error budget is spent."""
+        self.stats.rejected += 1
+        if self._handle is not None:
+            csv.writer(self._handle).writerow([row_num, reason, *record])
+        if self.max_errors is not None and self.stats.rejected > self.max_errors:
+            self.close()
+            raise ValueError(
+                f"Rejected {self.stats.rejected} rows (last at row {row_num}: {reason}), "
+                f"exceeding the error budget of {self.max_errors}"
+            )
+        if self.stats.rows >= self.min_ratio_rows:
+            self._check_ratio()
+
+    def finish(self) -> None:
+        """Close the quarantine file and apply the ratio budget."""
+        self.close()
+        self._check_ratio()
+
+    def _check_ratio(self) -> None:
+        if self.max_error_ratio is not None and self.stats.rejected_ratio > self.max_error_ratio:
+            self.close()
+            raise ValueError(
+                f"Rejected {self.stats.rejected} of {self.stats.rows} rows "
+                f"({self.stats.rejected_ratio:.2%}), exceeding the error budget of {self.max_error_ratio:.2%}"
+            )
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def read_csv(path: Path, quarantine: RowQuarantine | None = None) -> Iterator[SensorReading]:
+    """Load sensor readings from CSV file with error handling.
+
+    Without ``quarantine`` the first malformed row raises ``ValueError``; with
+    it, malformed rows are handed to the quarantine and loading continues.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Data file not found: {path}")
+    try:
+        with open_text(path) as handle:
+            reader = csv.reader(handle)
+            fieldnames = next(reader, None)
+            if fieldnames is None:
+                return
+            check_columns(fieldnames, path)
+            if quarantine is not None:
+                quarantine.open(fieldnames)
+            try:
+                row_num = 2  # Header is row 1
+                for block in _blocks(reader):
+                    readings, errors = parse_records(fieldnames, block)
+                    if errors and quarantine is None:
+                        first = min(errors)
+                        yield from readings[:first]
+                        raise ValueError(f"Invalid data at row {row_num + first}: {errors[first]}") from errors[first]
+                    if quarantine is not None:
+                        quarantine.stats.rows += len(block)
+                        for index in sorted(errors):
+                            quarantine.reject(row_num + index, _reason(errors[index]), block[index])
+                    yield from readings
+                    row_num += len(block)
+            finally:
+                if quarantine is not None:
+                    quarantine.close()
+            if quarantine is not None:
+                quarantine.finish()
+    except _READ_ERRORS as e:
+        raise IOError(f"Failed to read file {path}: {e}") from e
+
+
+@dataclass
+class _ChunkResult:
+    """What a worker sends back for one byte range of the file."""
+
+    rows: int = 0
+    error: tuple[int, str] | None = None
+    rejected: list[tuple[int, str, list[str]]] = field(default_factory=list)
+    columns: SharedBatchHandle | None = None
+    readings: list[SensorReading] = field(default_factory=list)
+    buckets: dict[str, RollupBucket] | None = None
+
+    def discard(self) -> None:
+        """Remove the shared segment of a result that will not be read."""
+        if self.columns is not None:
+            SharedColumns.adopt(self.columns).close()
+            self.columns = None
+
+
+def split_chunks(path: Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> tuple[list[str], list[tuple[int, int]]]:
+    """
+    Return the header fields and newline-aligned ``(start, end)`` byte ranges.
+
+    Each range starts right after a newline, so no record is split. Quoted
+    fields containing newlines are not supported by this splitting.
+    """
+    if chunk_bytes <= 0:
+        raise ValueError("chunk_bytes must be positive")
+    size = path.stat().st_size
+    with path.open("rb") as handle:
+        header_line = handle.readline()
+        fieldnames = next(csv.reader([header_line.decode("utf-8")]), [])
+        start = handle.tell()
+        ranges = []
+        while start < size:
+            handle.seek(min(start + chunk_bytes, size))
+            if handle.tell() < size:
+                handle.readline()
+            end = handle.tell()
+            ranges.append((start, end))
+            start = end
+    return fieldnames, ranges
+
+
+def _parse_chunk(
+    path: Path,
+    fieldnames: list[str],
+    start: int,
+    end: int,
+    outlier_threshold: float | None,
+    tolerant: bool,
+) -> _ChunkResult:
+    """Parse one byte range; runs inside a worker process."""
+    with path.open("rb") as handle:
+        handle.seek(start)
+        text = handle.read(end - start).decode("utf-8")
+    result = _ChunkResult()
+    if outlier_threshold is not None:
+        result.buckets = {}
+    records = [record for record in csv.reader(io.StringIO(text)) if record]
+    readings, errors = parse_records(fieldnames, records)
+    result.rows = len(records)
+    if errors and not tolerant:
+        first = min(errors)
+        result.error = (first, str(errors[first]))
+        result.rows = first
+        readings = readings[:first]
+    else:
+        result.rejected = [(index, _reason(errors[index]), records[index]) for index in sorted(errors)]
+    if result.buckets is not None:
+        for reading in readings:
+            bucket = result.buckets.get(reading.sensor_id)
+            if bucket is None:
+                bucket = result.buckets[reading.sensor_id] = RollupBucket()
+            bucket.add(reading.delta, outlier_threshold)
+        return result
+    if not readings:
+        return result
+    if any(reading.recorded_at.tzinfo is not None for reading in readings):
+        # Shared columns store UTC instants, which would drop the original offsets.
+        result.readings = readings
+    else:
+        result.columns = SharedColumns.from_batch(ReadingBatch(path.name, readings)).hand_off()
+    return result
+
+
+def _iter_chunk_results(
+    path: Path,
+    workers: int | None,
+    chunk_bytes: int,
+    outlier_threshold: float | None,
+    quarantine: RowQuarantine | None,
+) -> Iterator[tuple[int, _ChunkResult]]:
+    """
+    Yield ``(first_row_number, result)`` in file order with bounded read-ahead.
+
+    Rejected rows are handed to ``quarantine`` before the result is yielded.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Data file not found: {path}")
+    workers = workers or os.cpu_count() or 1
+    fieldnames, ranges = split_chunks(path, chunk_bytes)
+    if fieldnames or ranges:
+        check_columns(fieldnames, path)
+    if quarantine is not None:
+        quarantine.open(fieldnames)
+    try:
+        yield from _collect_chunks(path, fieldnames, ranges, workers, outlier_threshold, quarantine)
+    finally:
+        if quarantine is not None:
+            quarantine.close()
+    if quarantine is not None:
+        quarantine.finish()
+
+
+def _collect_chunks(
+    path: Path,
+    fieldnames: list[str],
+    ranges: list[tuple[int, int]],
+    workers: int,
+    outlier_threshold: float | None,
+    quarantine: RowQuarantine | None,
+) -> Iterator[tuple[int, _ChunkResult]]:
+    tolerant = quarantine is not None
+    with worker_pool(workers) as pool:
+        pending: deque[Future[_ChunkResult]] = deque()
+        ranges_iter = iter(ranges)
+        row_num = 2  # Header is row 1
+        try:
+            while True:
+                # Keep a couple of chunks per worker in flight so memory stays bounded.
+                while len(pending) < workers * 2:
+                    chunk = next(ranges_iter, None)
+                    if chunk is None:
+                        break
+                    pending.append(
+                        pool.submit(_parse_chunk, path, fieldnames, *chunk, outlier_threshold, tolerant)
+                    )
+                if not pending:
+                    return
+                result = pending.popleft().result()
+                if quarantine is not None:
+                    quarantine.stats.rows += result.rows
+                    for index, reason, record in result.rejected:
+                        try:
+                            quarantine.reject(row_num + index, reason, record)
+                        except ValueError:
+                            result.discard()
+                            raise
+                yield row_num, result
+                if result.error is not None:
+                    return
+                row_num += result.rows
+        finally:
+            # Chunks parsed ahead but never read still own a shared segment.
+            pool.shutdown(cancel_futures=True)
+            for future in pending:
+                if not future.cancelled() and future.exception() is None:
+                    future.result().discard()
+
+
+def read_csv_parallel(
+    path: Path,
+    workers: int | None = None,
+    *,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    quarantine: RowQuarantine | None = None,
+) -> Iterator[SensorReading]:
+    """
+    Load readings like :func:`read_csv`, parsing byte-range chunks in a process pool.
+
+    Workers write each parsed chunk into a shared-memory segment and return
+    only its handle; chunks are read back in file order, so the sequence of
+    readings and the row number in error messages match the serial loader.
+    Chunks with timezone-aware timestamps are pickled back as readings
+    instead, keeping their UTC offsets. Compressed files cannot be split by
+    byte range and are read serially through :func:`read_csv` instead.
+    """
+    if path.exists() and detect_compression(path) is not None:
+        yield from read_csv(path, quarantine)
+        return
+    for row_num, result in _iter_chunk_results(path, workers, chunk_bytes, None, quarantine):
+        if result.columns is not None:
+            with SharedColumns.adopt(result.columns) as columns:
+                for index in range(len(columns)):
+                    yield columns.reading(index)
+        else:
+            yield from result.readings
+        if result.error is not None:
+            index, message = result.error
+            raise ValueError(f"Invalid data at row {row_num + index}: {message}")
+
+
+def _sensor_buckets(
+    path: Path,
+    workers: int | None,
+    outlier_threshold: float,
+    chunk_bytes: int,
+    quarantine: RowQuarantine | None,
+) -> dict[str, RollupBucket]:
+    if outlier_threshold < 0:
+        raise ValueError("outlier_threshold must be non-negative")
+    totals: dict[str, RollupBucket] = {}
+    if path.exists() and detect_compression(path) is not None:
+        for reading in read_csv(path, quarantine):
+            bucket = totals.get(reading.sensor_id)
+            if bucket is None:
+                bucket = totals[reading.sensor_id] = RollupBucket()
+            bucket.add(reading.delta, outlier_threshold)
+        return totals
+    chunks = _iter_chunk_results(path, workers, chunk_bytes, outlier_threshold, quarantine)
+    for row_num, result in chunks:
+        if result.error is not None:
+            index, message = result.error
+            raise ValueError(f"Invalid data at row {row_num + index}: {message}")
+        for sensor_id, bucket in (result.buckets or {}).items():
+            totals.setdefault(sensor_id, RollupBucket()).merge(bucket)
+    return totals
+
+
+def summarize_csv_parallel(
+    path: Path,
+    workers: int | None = None,
+    *,
+    outlier_threshold: float = 5.0,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    quarantine: RowQuarantine | None = None,
+) -> ReliabilityMetrics:
+    """Compute whole-file metrics from per-chunk accumulators without shipping readings."""
+    total = RollupBucket()
+    for bucket in _sensor_buckets(path, workers, outlier_threshold, chunk_bytes, quarantine).values():
+        total.merge(bucket)
+    return total.to_metrics()
+
+
+def summarize_sensors_parallel(
+    path: Path,
+    workers: int | None = None,
+    *,
+    outlier_threshold: float = 5.0,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    quarantine: RowQuarantine | None = None,
+) -> dict[str, ReliabilityMetrics]:
+    """Per-sensor metrics merged from per-chunk accumulators, in first-seen order."""
+    buckets = _sensor_buckets(path, workers, outlier_threshold, chunk_bytes, quarantine)
+    return {sensor_id: bucket.to_metrics() for sensor_id, bucket in buckets.items()}
@@ -3,12 +3,20 @@
 from __future__ import annotations
 
 import csv
+import heapq
 from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
+from .detection import DriftDetector
 from .metrics import ReliabilityMetrics
-from .models import ReadingBatch
+from .models import ReadingBatch, SensorReading
+from .rollup import RollupBucket, RollupStore
+
+SORT_KEYS = ("outlier_ratio", "std_dev", "max_delta")
 
 
 @dataclass
@@ -18,11 +26,39 @@ class ReportLine:
     average_delta: float
     std_dev: float
     outlier_ratio: float
+    max_delta: float = 0.0
+
+    @classmethod
+    def from_metrics(cls, source: str, metrics: ReliabilityMetrics) -> "ReportLine":
+        return cls(
+            source=source,
+            count=metrics.count,
+            average_delta=metrics.average_delta,
+            std_dev=metrics.std_dev,
+            outlier_ratio=metrics.outlier_ratio,
+            max_delta=metrics.max_delta,
+        )
 
     def as_text(self) -> str:
         return (
             f"{self.source:>12} | count={self.count:3d} "
-            f"avg={self.average_delta:+.3f} std={self.std_dev:.3f} outliers={self.outlier_ratio:.2%}"
+            f"avg={self.average_delta:+.3f} std={self.std_dev:.3f} outliers={self.outlier_ratio:.2%} "
+            f"max={self.max_delta:.3f}"
+        )
+
+
+@dataclass
+class DriftLine:
+    sensor_id: str
+    count: int
+    drift_slope: float
+    ewma: float
+    anomalies: int
+
+    def as_text(self) -> str:
+        return (
+            f"{self.sensor_id:>12} | count={self.count:3d} "
+            f"drift={self.drift_slope:+.4f}/reading ewma={self.ewma:+.3f} anomalies={self.anomalies}"
         )
 
 
@@ -31,20 +67,70 @@ class ReportBuilder:
         output: list[ReportLine] = []
         for batch in batches:
             metrics = ReliabilityMetrics.from_readings(batch.readings)
-            output.append(
-                ReportLine(
-                    source=batch.source,
-                    count=metrics.count,
-                    average_delta=metrics.average_delta,
-                    std_dev=metrics.std_dev,
-                    outlier_ratio=metrics.outlier_ratio,
-                )
-            )
+            output.append(ReportLine.from_metrics(batch.source, metrics))
         return output
 
+    def iter_sensor_lines(
+        self, readings: Iterable[SensorReading], *, outlier_threshold: float = 5.0
+    ) -> Iterator[ReportLine]:
+        """Stream one line per sensor, keeping only a small accumulator per sensor."""
+        buckets: dict[str, RollupBucket] = {}
+        for reading in readings:
+            bucket = buckets.get(reading.sensor_id)
+            if bucket is None:
+                bucket = buckets[reading.sensor_id] = RollupBucket()
+            bucket.add(reading.delta, outlier_threshold)
+        for sensor_id, bucket in buckets.items():
+            yield ReportLine.from_metrics(sensor_id, bucket.to_metrics())
+
+    def rank(
+        self, lines: Iterable[ReportLine], top: int, sort_by: str = "outlier_ratio"
+    ) -> list[ReportLine]:
+        """Return the ``top`` worst lines by ``sort_by`` using a bounded heap."""
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        if top < 1:
+            raise ValueError("top must be at least 1")
+        return heapq.nlargest(top, lines, key=attrgetter(sort_by))
+
+    def build_range(self, store: RollupStore, start: datetime, end: datetime) -> list[ReportLine]:
+        """Build one line per sensor for ``[start, end)`` from rollup buckets."""
+        buckets = store.query(start, end)
+        return [
+            ReportLine.from_metrics(sensor_id, buckets[sensor_id].to_metrics())
+            for sensor_id in sorted(buckets)
+        ]
+
     def format(self, batches: Iterable[ReadingBatch], style: str = "table") -> str:
-        """Format report with different styles."""
-        lines = self.build(batches)
+        """Format report with different styles.
+
+        To render the same data in several styles, call :meth:`build` once and
+        pass its lines to :meth:`render` for each style instead.
+        """
+        return self.render(self.build(batches), style)
+
+    def iter_render(
+        self, lines: Iterable[ReportLine], style: str = "table", page_size: int = 50
+    ) -> Iterator[str]:
+        """Render lines a page at a time; the table header is only emitted once."""
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        iterator = iter(lines)
+        first = True
+        while True:
+            page = list(islice(iterator, page_size))
+            if not page:
+                if first and style == "table":
+                    yield self._format_table([])
+                return
+            text = self.render(page, style)
+            if style == "table" and not first:
+                text = "\n".join(line.as_text() for line in page)
+            first = False
+            yield text
+
+    def render(self, lines: list[ReportLine], style: str = "table") -> str:
+        """Format already-built report lines."""
         if style == "table":
             return self._format_table(lines)
         elif style == "compact":
@@ -54,9 +140,40 @@ class ReportBuilder:
         else:
             return "\n".join(line.as_text() for line in lines)
 
+    def build_drift(
+        self, batches: Iterable[ReadingBatch], detector: DriftDetector | None = None
+    ) -> list[DriftLine]:
+        """Run drift detection over all batches and return one line per sensor."""
+        detector = detector if detector is not None else DriftDetector()
+        for batch in batches:
+            for reading in batch.readings:
+                detector.update(reading)
+        return self.drift_lines(detector)
+
+    def drift_lines(self, detector: DriftDetector) -> list[DriftLine]:
+        """Return one drift line per sensor from a detector that has already run."""
+        return [
+            DriftLine(
+                sensor_id=state.sensor_id,
+                count=state.count,
+                drift_slope=state.drift.slope,
+                ewma=state.ewma.value,
+                anomalies=state.anomalies,
+            )
+            for state in detector.states.values()
+        ]
+
+    def format_drift(self, lines: list[DriftLine]) -> str:
+        """Format per-sensor drift columns as a table."""
+        header = f"{'Sensor':>12} | {'Count':>5} | {'Drift':>10} | {'EWMA':>8} | {'Anomalies':>9}"
+        separator = "-" * len(header)
+        return "\n".join([header, separator] + [line.as_text() for line in lines])
+
     def _format_table(self, lines: list[ReportLine]) -> str:
         """Format as a table with headers."""
-        header = f"{'Source':>12} | {'Count':>5} | {'Avg Delta':>10} | {'Std Dev':>8} | {'Outliers':>8}"
+        header = (
+            f"{'Source':>12} | {'Count':>5} | {'Avg Delta':>10} | {'Std Dev':>8} | {'Outliers':>8} | {'Max Delta':>9}"
+        )
         separator = "-" * len(header)
         rows = [header, separator] + [line.as_text() for line in lines]
         return "\n".join(rows)
@@ -65,7 +182,7 @@ class ReportBuilder:
         """Format as compact single-line entries."""
         return "\n".join(
             f"{line.source}: {line.count} readings, "
-            f"avg={line.average_delta:+.3f}, outliers={line.outlier_ratio:.1%}"
+            f"avg={line.average_delta:+.3f}, outliers={line.outlier_ratio:.1%}, max={line.max_delta:.3f}"
             for line in lines
         )
 
@@ -78,6 +195,7 @@ class ReportBuilder:
             result.append(f"  Average Delta: {line.average_delta:+.6f}")
             result.append(f"  Standard Deviation: {line.std_dev:.6f}")
             result.append(f"  Outlier Ratio: {line.outlier_ratio:.2%}")
+            result.append(f"  Max Delta: {line.max_delta:.6f}")
             result.append("")
         return "\n".join(result)
 
@@ -0,0 +1,317 @@
+"""Time-bucketed rollup tables for long-horizon reports."""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+
+from .metrics import ReliabilityMetrics
+from .models import SensorReading
+
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# Each resolution is split into one file per period, named with these formats,
+# so a query only reads the periods its buckets fall in.
+PARTITIONS = {"1m": "%Y-%m-%d", "1h": "%Y-%m", "1d": "%Y"}
+
+_BUCKET_FIELDS = ["sensor_id", "bucket_start", "count", "total", "total_sq", "outliers", "max_abs_delta"]
+
+
+@dataclass
+class RollupBucket:
+    """Mergeable delta statistics for one sensor over one time bucket."""
+
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    outliers: int = 0
+    max_abs_delta: float = 0.0
+
+    def add(self, delta: float, outlier_threshold: float) -> None:
+        """Fold a single delta into the bucket."""
+        abs_delta = abs(delta)
+        self.count += 1
+        self.total += delta
+        self.total_sq += delta * delta
+        if abs_delta >= outlier_threshold:
+            self.outliers += 1
+        if abs_delta > self.max_abs_delta:
+            self.max_abs_delta = abs_delta
+
+    def merge(self, other: "RollupBucket") -> None:
+        """Combine another bucket into this one."""
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.outliers += other.outliers
+        self.max_abs_delta = max(self.max_abs_delta, other.max_abs_delta)
+
+    def to_metrics(self) -> ReliabilityMetrics:
+        """Derive the same metrics :meth:`ReliabilityMetrics.from_readings` reports."""
+        if self.count == 0:
+            return ReliabilityMetrics(count=0, average_delta=0.0, std_dev=0.0, outlier_ratio=0.0, max_delta=0.0)
+        avg = self.total / self.count
+        variance = max(self.total_sq / self.count - avg * avg, 0.0)
+        return ReliabilityMetrics(
+            count=self.count,
+            average_delta=avg,
+            std_dev=math.sqrt(variance) if self.count > 1 else 0.0,
+            outlier_ratio=self.outliers / self.count,
+            max_delta=self.max_abs_delta,
+        )
+
+
+def _normalize(moment: datetime) -> datetime:
+    """Express a timestamp as naive UTC; naive timestamps are taken to be UTC already."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _floor(moment: datetime, width: int) -> datetime:
+    """Align a timestamp to the start of its bucket."""
+    epoch = datetime(1970, 1, 1, tzinfo=moment.tzinfo)
+    offset = (moment - epoch) // timedelta(seconds=width)
+    return epoch + timedelta(seconds=offset * width)
+
+
+def _ceil(moment: datetime, width: int) -> datetime:
+    floored = _floor(moment, width)
+    return floored if floored == moment else floored + timedelta(seconds=width)
+
+
+_Table = dict[datetime, dict[str, RollupBucket]]
+
+
+@dataclass
+class RollupStore:
+    """
+    Per-sensor rollup buckets at several resolutions.
+
+    Buckets are keyed by their start time so a range query only touches the
+    buckets it needs. On disk each resolution is split into one CSV per
+    period (see ``PARTITIONS``); a store opened with :meth:`load` reads a
+    period file the first time one of its buckets is needed, so a long
+    query reads a handful of coarse files plus the fine files at its edges.
+
+    A store with a ``directory`` writes each period to disk and drops it
+    from memory as soon as a reading for a later period of the same
+    resolution arrives, so building from time-ordered input holds about one
+    period per resolution. Out-of-order readings are still counted, by
+    reading the period back, but arbitrarily shuffled input loses the
+    memory bound and rewrites period files repeatedly.
+
+    Timestamps are bucketed in UTC: timezone-aware readings and query bounds
+    are converted, naive ones are taken as UTC. Outliers are counted against
+    the threshold in effect when the store was built.
+
+    Attributes:
+        outlier_threshold: Absolute delta at which a reading counts as an outlier
+        resolutions: Bucket resolutions kept, as keys of ``RESOLUTIONS``
+        directory: Where period files are read from and flushed to, if anywhere
+    """
+
+    outlier_threshold: float = 5.0
+    resolutions: tuple[str, ...] = tuple(RESOLUTIONS)
+    directory: Path | None = None
+    _partitions: dict[tuple[str, str], _Table] = field(default_factory=dict, init=False, repr=False)
+    _dirty: set[tuple[str, str]] = field(default_factory=set, init=False, repr=False)
+    _latest: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        unknown = set(self.resolutions) - set(RESOLUTIONS)
+        if unknown:
+            raise ValueError(f"Unknown resolutions: {', '.join(sorted(unknown))}")
+        # Coarsest first, which is the order range queries consume them in.
+        self.resolutions = tuple(sorted(self.resolutions, key=RESOLUTIONS.__getitem__, reverse=True))
+
+    @classmethod
+    def from_readings(
+        cls, readings: Iterable[SensorReading], *, outlier_threshold: float = 5.0
+    ) -> "RollupStore":
+        store = cls(outlier_threshold=outlier_threshold)
+        store.extend(readings)
+        return store
+
+    def _partition(self, resolution: str, period: str) -> _Table:
+        key = (resolution, period)
+        table = self._partitions.get(key)
+        if table is None:
+            table = self._partitions[key] = self._read_partition(resolution, period)
+        return table
+
+    def _read_partition(self, resolution: str, period: str) -> _Table:
+        table: _Table = {}
+        if self.directory is None:
+            return table
+        path = self.directory / resolution / f"{period}.csv"
+        if not path.exists():
+            return table
+        with path.open("r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                sensors = table.setdefault(datetime.fromisoformat(row["bucket_start"]), {})
+                sensors[row["sensor_id"]] = RollupBucket(
+                    count=int(row["count"]),
+                    total=float(row["total"]),
+                    total_sq=float(row["total_sq"]),
+                    outliers=int(row["outliers"]),
+                    max_abs_delta=float(row["max_abs_delta"]),
+                )
+        return table
+
+    def _periods(self, resolution: str) -> list[str]:
+        """Every period holding buckets for ``resolution``, on disk or in memory."""
+        periods = {period for res, period in self._partitions if res == resolution}
+        if self.directory is not None:
+            periods.update(path.stem for path in (self.directory / resolution).glob("*.csv"))
+        return sorted(periods)
+
+    def bucket(self, resolution: str, bucket_start: datetime) -> dict[str, RollupBucket]:
+        """Per-sensor buckets starting at ``bucket_start``, empty if there are none."""
+        period = bucket_start.strftime(PARTITIONS[resolution])
+        return self._partition(resolution, period).get(bucket_start, {})
+
+    def add(self, reading: SensorReading) -> None:
+        """Fold one reading into every resolution."""
+        delta = reading.delta
+        recorded_at = _normalize(reading.recorded_at)
+        for resolution in self.resolutions:
+            start = _floor(recorded_at, RESOLUTIONS[resolution])
+            key = (resolution, start.strftime(PARTITIONS[resolution]))
+            latest = self._latest.get(resolution)
+            if latest is None or key[1] > latest:
+                if latest is not None and self.directory is not None:
+                    self._flush(resolution, key[1])
+                self._latest[resolution] = key[1]
+            sensors = self._partition(*key).setdefault(start, {})
+            bucket = sensors.get(reading.sensor_id)
+            if bucket is None:
+                bucket = sensors[reading.sensor_id] = RollupBucket()
+            bucket.add(delta, self.outlier_threshold)
+            self._dirty.add(key)
+
+    def _flush(self, resolution: str, before: str) -> None:
+        """Write and drop the periods of ``resolution`` that precede ``before``."""
+        for key in [key for key in self._partitions if key[0] == resolution and key[1] < before]:
+            table = self._partitions.pop(key)
+            if key in self._dirty:
+                self._write_partition(self.directory, *key, table)
+                self._dirty.discard(key)
+
+    def _write_partition(self, directory: Path, resolution: str, period: str, table: _Table) -> None:
+        (directory / resolution).mkdir(parents=True, exist_ok=True)
+        with (directory / resolution / f"{period}.csv").open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(_BUCKET_FIELDS)
+            for bucket_start in sorted(table):
+                for sensor_id, bucket in table[bucket_start].items():
+                    writer.writerow(
+                        [
+                            sensor_id,
+                            bucket_start.isoformat(),
+                            bucket.count,
+                            repr(bucket.total),
+                            repr(bucket.total_sq),
+                            bucket.outliers,
+                            repr(bucket.max_abs_delta),
+                        ]
+                    )
+
+    def extend(self, readings: Iterable[SensorReading]) -> None:
+        for reading in readings:
+            self.add(reading)
+
+    def span(self) -> tuple[datetime, datetime] | None:
+        """Return the half-open time range covered by the finest buckets."""
+        finest = self.resolutions[-1]
+        periods = self._periods(finest)
+        if not periods:
+            return None
+        starts = [start for period in {periods[0], periods[-1]} for start in self._partition(finest, period)]
+        if not starts:
+            return None
+        return min(starts), max(starts) + timedelta(seconds=RESOLUTIONS[finest])
+
+    def _cover(self, start: datetime, end: datetime, levels: tuple[str, ...]) -> list[tuple[str, datetime]]:
+        """Split ``[start, end)`` into whole buckets, coarsest in the interior."""
+        if start >= end or not levels:
+            return []
+        width = RESOLUTIONS[levels[0]]
+        inner_start, inner_end = _ceil(start, width), _floor(end, width)
+        if inner_start >= inner_end:
+            return self._cover(start, end, levels[1:])
+        step = timedelta(seconds=width)
+        buckets = []
+        moment = inner_start
+        while moment < inner_end:
+            buckets.append((levels[0], moment))
+            moment += step
+        return self._cover(start, inner_start, levels[1:]) + buckets + self._cover(inner_end, end, levels[1:])
+
+    def query(self, start: datetime, end: datetime) -> dict[str, RollupBucket]:
+        """
+        Combine buckets covering ``[start, end)`` into one bucket per sensor.
+
+        The interior of the range is answered from the coarsest buckets that
+        fit, narrowing to finer buckets towards the edges. Both ends must
+        fall on a boundary of the finest resolution kept; use :meth:`align`
+        to widen an arbitrary range to the nearest boundaries.
+        """
+        start, end = _normalize(start), _normalize(end)
+        finest = self.resolutions[-1]
+        width = RESOLUTIONS[finest]
+        if _floor(start, width) != start or _floor(end, width) != end:
+            raise ValueError(f"Range {start} to {end} is not aligned to {finest} buckets")
+        result: dict[str, RollupBucket] = {}
+        for resolution, bucket_start in self._cover(start, end, self.resolutions):
+            for sensor_id, bucket in self.bucket(resolution, bucket_start).items():
+                result.setdefault(sensor_id, RollupBucket()).merge(bucket)
+        return result
+
+    def align(self, start: datetime, end: datetime) -> tuple[datetime, datetime]:
+        """Widen ``[start, end)`` outwards to the finest bucket boundaries, in UTC."""
+        width = RESOLUTIONS[self.resolutions[-1]]
+        return _floor(_normalize(start), width), _ceil(_normalize(end), width)
+
+    def save(self, directory: Path | None = None) -> None:
+        """
+        Persist the store as one CSV per resolution and period plus a metadata file.
+
+        Saving back to the directory the store was loaded from only rewrites
+        the periods that received new readings. Saving anywhere else refuses
+        to overwrite an existing store.
+        """
+        directory = directory if directory is not None else self.directory
+        if directory is None:
+            raise ValueError("directory is required for a store that was not loaded from disk")
+        if directory == self.directory:
+            keys = sorted(self._dirty)
+        elif (directory / "rollup.json").exists():
+            raise FileExistsError(f"{directory} already holds a rollup store; load it to add readings")
+        else:
+            keys = [(res, period) for res in self.resolutions for period in self._periods(res)]
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = {"outlier_threshold": self.outlier_threshold, "resolutions": list(self.resolutions)}
+        (directory / "rollup.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        for resolution, period in keys:
+            self._write_partition(directory, resolution, period, self._partition(resolution, period))
+        self.directory = directory
+        self._dirty.clear()
+
+    @classmethod
+    def load(cls, directory: Path) -> "RollupStore":
+        """Open a store previously written by :meth:`save`; period files are read on demand."""
+        meta_path = directory / "rollup.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Rollup metadata not found: {meta_path}")
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return cls(
+            outlier_threshold=meta["outlier_threshold"],
+            resolutions=tuple(meta["resolutions"]),
+            directory=directory,
+        )
@@ -0,0 +1,326 @@
+"""Shared-memory hand-off of columnar readings between worker processes."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Iterator, TypeVar
+
+from .metrics import ReliabilityMetrics
+from .models import ReadingBatch, SensorReading
+from .rollup import RollupBucket
+from .simulation import ScenarioSimulator
+
+T = TypeVar("T")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Per-row layout: int64 timestamp, float64 value, float64 expected, int32 sensor code.
+_ROW_BYTES = 8 + 8 + 8 + 4
+
+
+@dataclass(frozen=True)
+class SharedBatchHandle:
+    """Picklable descriptor that lets another process attach to a segment."""
+
+    name: str
+    length: int
+    source: str
+    sensor_ids: tuple[str, ...]
+    aware: bool = False
+
+
+def _release(shm: shared_memory.SharedMemory, views: list[memoryview], unlink: bool) -> None:
+    # Views must be released before the mapping can be closed.
+    for view in views:
+        view.release()
+    shm.close()
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedColumns:
+    """
+    Columnar readings stored in one ``multiprocessing.shared_memory`` segment.
+
+    The creating process owns the segment and unlinks it on :meth:`close`,
+    when the object is garbage collected, or at interpreter exit. If the
+    owner is killed outright, the standard library resource tracker removes
+    the segment. Workers :meth:`attach` through a :class:`SharedBatchHandle`
+    and only ever close their own mapping. A worker that fills a segment for
+    its parent passes ownership with :meth:`hand_off` and :meth:`adopt`.
+    """
+
+    def __init__(self, handle: SharedBatchHandle, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self.handle = handle
+        self._shm = shm
+        n = handle.length
+        buffer = shm.buf
+        self.timestamps = buffer[0 : 8 * n].cast("q")
+        self.values = buffer[8 * n : 16 * n].cast("d")
+        self.expected = buffer[16 * n : 24 * n].cast("d")
+        self.codes = buffer[24 * n : 28 * n].cast("i")
+        self._views = [self.timestamps, self.values, self.expected, self.codes]
+        self._finalizer = weakref.finalize(self, _release, shm, self._views, owner)
+
+    @classmethod
+    def allocate(
+        cls, length: int, sensor_ids: tuple[str, ...], *, source: str = "shared", aware: bool = False
+    ) -> "SharedColumns":
+        """Create an empty owned segment for ``length`` readings."""
+        if length < 0:
+            raise ValueError("length must be non-negative")
+        shm = shared_memory.SharedMemory(create=True, size=max(length * _ROW_BYTES, 1))
+        handle = SharedBatchHandle(
+            name=shm.name, length=length, source=source, sensor_ids=tuple(sensor_ids), aware=aware
+        )
+        return cls(handle, shm, owner=True)
+
+    @classmethod
+    def from_batch(cls, batch: ReadingBatch) -> "SharedColumns":
+        """Copy a batch into a new owned segment."""
+        sensor_ids = tuple(dict.fromkeys(r.sensor_id for r in batch.readings))
+        awareness = {r.recorded_at.tzinfo is not None for r in batch.readings}
+        if len(awareness) > 1:
+            raise ValueError("cannot mix naive and timezone-aware timestamps")
+        columns = cls.allocate(
+            len(batch.readings), sensor_ids, source=batch.source, aware=awareness == {True}
+        )
+        codes = {sensor_id: code for code, sensor_id in enumerate(sensor_ids)}
+        for index, reading in enumerate(batch.readings):
+            columns.write(index, codes[reading.sensor_id], reading.recorded_at, reading.value, reading.expected)
+        return columns
+
+    @classmethod
+    def attach(cls, handle: SharedBatchHandle) -> "SharedColumns":
+        """Map an existing segment without taking ownership of it."""
+        return cls(handle, shared_memory.SharedMemory(name=handle.name), owner=False)
+
+    @classmethod
+    def adopt(cls, handle: SharedBatchHandle) -> "SharedColumns":
+        """Map a segment passed on with :meth:`hand_off` and become its owner."""
+        return cls(handle, shared_memory.SharedMemory(name=handle.name), owner=True)
+
+    def hand_off(self) -> SharedBatchHandle:
+        """
+        Close this mapping but leave the segment for another process to :meth:`adopt`.
+
+        The segment stays registered with the resource tracker, which pool
+        workers share with their parent, so it outlives this process but is
+        still removed if the parent is killed before adopting it.
+        """
+        self._finalizer.detach()
+        _release(self._shm, self._views, unlink=False)
+        return self.handle
+
+    def __len__(self) -> int:
+        return self.handle.length
+
+    def __enter__(self) -> "SharedColumns":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, index: int, code: int, recorded_at: datetime, value: float, expected: float) -> None:
+        """Store one reading at ``index``."""
+        if self.handle.aware:
+            recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+        self.timestamps[index] = (recorded_at - _EPOCH) // _MICROSECOND
+        self.values[index] = value
+        self.expected[index] = expected
+        self.codes[index] = code
+
+    def reading(self, index: int) -> SensorReading:
+        """Materialise the reading stored at ``index``."""
+        recorded_at = _EPOCH + self.timestamps[index] * _MICROSECOND
+        if self.handle.aware:
+            recorded_at = recorded_at.replace(tzinfo=timezone.utc)
+        return SensorReading(
+            sensor_id=self.handle.sensor_ids[self.codes[index]],
+            recorded_at=recorded_at,
+            value=self.values[index],
+            expected=self.expected[index],
+        )
+
+    def to_batch(self, start: int = 0, stop: int | None = None) -> ReadingBatch:
+        """Copy a slice back out as an ordinary batch."""
+        stop = len(self) if stop is None else stop
+        return ReadingBatch(
+            source=self.handle.source,
+            readings=[self.reading(index) for index in range(start, stop)],
+        )
+
+    def close(self) -> None:
+        """Drop this process's mapping, unlinking the segment if it is the owner."""
+        self._finalizer()
+
+
+def _exit_with_parent(parent_pid: int) -> None:
+    """Pool initializer: end the worker once the process that started it is gone."""
+
+    def watch() -> None:
+        while os.getppid() == parent_pid:
+            time.sleep(0.5)
+        os._exit(1)
+
+    threading.Thread(target=watch, name="solid-engine-parent-watch", daemon=True).start()
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Start a process pool for workers that create or map shared segments.
+
+    The resource tracker is started first so workers share it with this
+    process, and workers exit if this process is killed. The tracker then
+    sees every user disappear and removes any segment still registered.
+    """
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_exit_with_parent, initargs=(os.getpid(),)
+    )
+
+
+def _slices(length: int, parts: int) -> Iterator[tuple[int, int]]:
+    step = -(-length // parts) if length else 0
+    for start in range(0, length, step or 1):
+        yield start, min(start + step, length)
+
+
+def _run_on_slice(
+    func: Callable[[SharedColumns, int, int], T], handle: SharedBatchHandle, start: int, stop: int
+) -> T:
+    columns = SharedColumns.attach(handle)
+    try:
+        return func(columns, start, stop)
+    finally:
+        columns.close()
+
+
+def map_shared(
+    func: Callable[[SharedColumns, int, int], T],
+    columns: SharedColumns,
+    workers: int | None = None,
+) -> list[T]:
+    """
+    Run ``func(columns, start, stop)`` over contiguous slices in a process pool.
+
+    Only the handle and slice bounds are pickled; each worker maps the same
+    segment. ``func`` must be a module-level function.
+    """
+    workers = workers or os.cpu_count() or 1
+    with worker_pool(workers) as pool:
+        futures = [
+            pool.submit(_run_on_slice, func, columns.handle, start, stop)
+            for start, stop in _slices(len(columns), workers)
+        ]
+        return [future.result() for future in futures]
+
+
+def _bucket_slice(outlier_threshold: float, columns: SharedColumns, start: int, stop: int) -> dict[int, RollupBucket]:
+    buckets: dict[int, RollupBucket] = {}
+    values, expected, codes = columns.values, columns.expected, columns.codes
+    for index in range(start, stop):
+        bucket = buckets.get(codes[index])
+        if bucket is None:
+            bucket = buckets[codes[index]] = RollupBucket()
+        bucket.add(values[index] - expected[index], outlier_threshold)
+    return buckets
+
+
+def _inlier_slice(threshold: float, columns: SharedColumns, start: int, stop: int) -> array:
+    values, expected = columns.values, columns.expected
+    return array("q", (i for i in range(start, stop) if abs(values[i] - expected[i]) < threshold))
+
+
+def shared_metrics(
+    columns: SharedColumns, workers: int | None = None, *, outlier_threshold: float = 5.0
+) -> dict[str, ReliabilityMetrics]:
+    """Per-sensor metrics computed by workers reading the shared segment."""
+    totals: dict[int, RollupBucket] = {}
+    for partial_buckets in map_shared(partial(_bucket_slice, outlier_threshold), columns, workers):
+        for code, bucket in partial_buckets.items():
+            totals.setdefault(code, RollupBucket()).merge(bucket)
+    return {columns.handle.sensor_ids[code]: bucket.to_metrics() for code, bucket in totals.items()}
+
+
+def shared_filter_outliers(
+    columns: SharedColumns, workers: int | None = None, *, threshold: float = 5.0
+) -> array:
+    """Indices of readings with ``|delta| < threshold``, like :func:`filter_outliers`."""
+    kept = array("q")
+    for indices in map_shared(partial(_inlier_slice, threshold), columns, workers):
+        kept.extend(indices)
+    return kept
+
+
+def _simulate_slice(
+    simulator: ScenarioSimulator,
+    expected_value: float,
+    count: int,
+    start_time: datetime,
+    drift_rate: float,
+    columns: SharedColumns,
+    start: int,
+    stop: int,
+) -> None:
+    # Slices cover whole sensors: rows [code * count, (code + 1) * count).
+    for code in range(start // count, stop // count):
+        batch = simulator.generate(
+            columns.handle.sensor_ids[code],
+            expected_value,
+            count=count,
+            start_time=start_time,
+            drift_rate=drift_rate,
+        )
+        for offset, reading in enumerate(batch.readings):
+            columns.write(code * count + offset, code, reading.recorded_at, reading.value, reading.expected)
+
+
+def simulate_shared(
+    simulator: ScenarioSimulator,
+    sensor_ids: tuple[str, ...],
+    expected_value: float,
+    *,
+    count: int = 10,
+    start_time: datetime | None = None,
+    drift_rate: float = 0.0,
+    workers: int | None = None,
+) -> SharedColumns:
+    """Have workers generate readings for each sensor straight into a new segment."""
+    if count <= 0:
+        raise ValueError("count must be positive")
+    start_time = start_time if start_time is not None else datetime.utcnow()
+    columns = SharedColumns.allocate(len(sensor_ids) * count, tuple(sensor_ids), source="sim")
+    workers = min(workers or os.cpu_count() or 1, max(len(sensor_ids), 1))
+    func = partial(_simulate_slice, simulator, expected_value, count, start_time, drift_rate)
+    try:
+        per_worker = -(-len(sensor_ids) // workers) if sensor_ids else 1
+        with worker_pool(workers) as pool:
+            futures = [
+                pool.submit(
+                    _run_on_slice,
+                    func,
+                    columns.handle,
+                    first * count,
+                    min(first + per_worker, len(sensor_ids)) * count,
+                )
+                for first in range(0, len(sensor_ids), per_worker)
+            ]
+            for future in futures:
+                future.result()
+    except BaseException:
+        columns.close()
+        raise
+    return columns
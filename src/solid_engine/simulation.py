@@ -2,14 +2,29 @@
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import product
 from random import Random
-from typing import Iterable, List
+from typing import Iterable, List, Sequence
 
+from .metrics import ReliabilityMetrics
 from .models import ReadingBatch, SensorReading
 
 
+@dataclass(frozen=True)
+class ReplicateResult:
+    """Metrics from one simulated scenario replicate."""
+
+    jitter: float
+    noise_type: str
+    drift_rate: float
+    seed: int
+    metrics: ReliabilityMetrics
+
+
 @dataclass
 class ScenarioSimulator:
     """
@@ -86,3 +101,62 @@ class ScenarioSimulator:
                 new_readings.append(shifted)
             augmented.append(ReadingBatch(source=batch.source + "+", readings=new_readings))
         return augmented
+
+    def replicate(
+        self,
+        sensor_id: str,
+        expected_value: float,
+        *,
+        replicates: int = 100,
+        count: int = 10,
+        jitters: Sequence[float] | None = None,
+        noise_types: Sequence[str] | None = None,
+        drift_rates: Sequence[float] = (0.0,),
+        outlier_threshold: float = 5.0,
+        workers: int | None = None,
+    ) -> List[ReplicateResult]:
+        """
+        Run ``replicates`` seeded scenarios for every parameter combination.
+
+        Jitter and noise type default to this simulator's settings. Replicate
+        ``i`` uses seed ``self.seed + i``. Scenarios run in a process pool and
+        only their metrics are sent back, not the generated readings.
+
+        Returns:
+            One ReplicateResult per (jitter, noise_type, drift_rate, replicate)
+        """
+        if replicates < 1:
+            raise ValueError("replicates must be at least 1")
+        grid = product(
+            jitters if jitters is not None else (self.jitter,),
+            noise_types if noise_types is not None else (self.noise_type,),
+            drift_rates,
+            range(self.seed, self.seed + replicates),
+        )
+        tasks = [
+            (sensor_id, expected_value, count, jitter, noise_type, drift_rate, seed, outlier_threshold)
+            for jitter, noise_type, drift_rate, seed in grid
+        ]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            return [_run_replicate(task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            return list(pool.map(_run_replicate, tasks, chunksize=chunksize))
+
+
+def _run_replicate(
+    task: tuple[str, float, int, float, str, float, int, float],
+) -> ReplicateResult:
+    sensor_id, expected_value, count, jitter, noise_type, drift_rate, seed, outlier_threshold = task
+    simulator = ScenarioSimulator(seed=seed, jitter=jitter, noise_type=noise_type)
+    batch = simulator.generate(
+        sensor_id, expected_value, count=count, start_time=datetime(2000, 1, 1), drift_rate=drift_rate
+    )
+    return ReplicateResult(
+        jitter=jitter,
+        noise_type=noise_type,
+        drift_rate=drift_rate,
+        seed=seed,
+        metrics=ReliabilityMetrics.from_readings(batch.readings, outlier_threshold=outlier_threshold),
+    )
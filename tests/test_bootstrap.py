@@ -0,0 +1,68 @@
+"""Tests for bootstrap intervals and simulator replicates."""
+
+import pytest
+from datetime import datetime
+
+from solid_engine.bootstrap import bootstrap_intervals
+from solid_engine.metrics import ReliabilityMetrics
+from solid_engine.simulation import ScenarioSimulator
+
+START = datetime(2025, 1, 1)
+
+
+def _readings():
+    readings = []
+    for index, count in enumerate((50, 50, 80)):
+        simulator = ScenarioSimulator(seed=index, jitter=6.0)
+        readings.extend(
+            simulator.generate(f"sensor-{index}", 10.0, count=count, start_time=START).readings
+        )
+    return readings
+
+
+def test_intervals_bracket_point_estimates() -> None:
+    readings = _readings()
+
+    results = bootstrap_intervals(readings, replicates=500)
+
+    assert [result.sensor_id for result in results] == ["sensor-0", "sensor-1", "sensor-2"]
+    for result in results:
+        point = ReliabilityMetrics.from_readings(r for r in readings if r.sensor_id == result.sensor_id)
+        assert result.count == point.count
+        assert result.average_delta[0] <= point.average_delta <= result.average_delta[1]
+        assert result.std_dev[0] <= point.std_dev <= result.std_dev[1]
+        assert result.outlier_ratio[0] <= point.outlier_ratio <= result.outlier_ratio[1]
+
+
+def test_intervals_do_not_depend_on_block_size() -> None:
+    readings = _readings()
+
+    small = bootstrap_intervals(readings, replicates=200, max_elements=1_000)
+    large = bootstrap_intervals(readings, replicates=200)
+
+    for a, b in zip(small, large):
+        assert a.average_delta == pytest.approx(b.average_delta, abs=0.5)
+
+
+def test_intervals_reject_invalid_confidence() -> None:
+    with pytest.raises(ValueError, match="confidence"):
+        bootstrap_intervals([], confidence=1.5)
+
+
+def test_simulator_replicates_cover_parameter_grid() -> None:
+    simulator = ScenarioSimulator(seed=10)
+
+    results = simulator.replicate(
+        "sensor-1",
+        10.0,
+        replicates=3,
+        jitters=(0.5, 1.0),
+        noise_types=("uniform", "gaussian"),
+        workers=2,
+    )
+
+    assert len(results) == 12
+    assert {result.seed for result in results} == {10, 11, 12}
+    first = results[0]
+    batch = ScenarioSimulator(seed=10, jitter=0.5).generate("sensor-1", 10.0, count=10, start_time=START)
+    assert first.metrics == ReliabilityMetrics.from_readings(batch.readings)
@@ -0,0 +1,111 @@
+"""Tests for ingestion-time deduplication."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from solid_engine.dedup import BloomFilter, Deduplicator, deduplicate
+from solid_engine.models import SensorReading
+
+BASE = datetime(2025, 1, 1)
+
+
+def _reading(sensor_id: str, minute: int, value: float) -> SensorReading:
+    return SensorReading(sensor_id, BASE + timedelta(minutes=minute), value, 10.0)
+
+
+def test_ordered_first_wins_counts_duplicates() -> None:
+    readings = [
+        _reading("sensor-1", 0, 10.0),
+        _reading("sensor-1", 0, 11.0),
+        _reading("sensor-2", 0, 12.0),
+        _reading("sensor-1", 1, 13.0),
+    ]
+
+    result, stats = deduplicate(readings, "first")
+
+    assert sorted((r.sensor_id, r.value) for r in result) == [
+        ("sensor-1", 10.0),
+        ("sensor-1", 13.0),
+        ("sensor-2", 12.0),
+    ]
+    assert stats.duplicates == 1
+    assert stats.emitted == 3
+
+
+def test_ordered_policies_last_and_average() -> None:
+    readings = [_reading("sensor-1", 0, 10.0), _reading("sensor-1", 0, 12.0)]
+
+    last, _ = deduplicate(readings, "last")
+    average, _ = deduplicate(readings, "average")
+
+    assert [r.value for r in last] == [12.0]
+    assert [r.value for r in average] == [11.0]
+
+
+def test_ordered_keeps_late_unique_readings() -> None:
+    readings = [
+        _reading("sensor-1", 1, 10.0),
+        _reading("sensor-1", 0, 11.0),
+        _reading("sensor-1", 2, 12.0),
+    ]
+
+    result, stats = deduplicate(readings, "first")
+
+    assert sorted(r.value for r in result) == [10.0, 11.0, 12.0]
+    assert stats.late == 1
+    assert stats.duplicates == 0
+
+
+def test_ordered_drops_late_retransmits_of_emitted_readings() -> None:
+    readings = [
+        _reading("sensor-1", 0, 10.0),
+        _reading("sensor-1", 1, 11.0),
+        _reading("sensor-1", 2, 12.0),
+        _reading("sensor-1", 0, 99.0),
+        _reading("sensor-1", 0, 98.0),
+    ]
+
+    result, stats = deduplicate(readings, "last")
+
+    assert sorted(r.value for r in result) == [10.0, 11.0, 12.0]
+    assert stats.late == 2
+    assert stats.duplicates == 2
+
+
+def test_unordered_keeps_out_of_order_readings() -> None:
+    readings = [
+        _reading("sensor-1", 2, 10.0),
+        _reading("sensor-1", 1, 11.0),
+        _reading("sensor-1", 2, 12.0),
+    ]
+
+    for policy in ("first", "last", "average"):
+        result, stats = deduplicate(readings, policy, ordered=False)
+        assert len(result) == 2
+        assert stats.duplicates == 1
+        assert stats.late == 0
+
+
+def test_unordered_bloom_filter_matches_exact_set() -> None:
+    readings = [_reading("sensor-1", minute % 50, 10.0) for minute in range(200)]
+    deduplicator = Deduplicator(ordered=False, bloom_capacity=1000)
+
+    result = list(deduplicator.process(readings))
+
+    assert len(result) == 50
+    assert deduplicator.stats.duplicates == 150
+
+
+def test_deduplicator_rejects_invalid_configuration() -> None:
+    with pytest.raises(ValueError, match="policy"):
+        Deduplicator(policy="median")
+    with pytest.raises(ValueError, match="unordered"):
+        Deduplicator(bloom_capacity=10)
+    with pytest.raises(ValueError, match="first"):
+        Deduplicator(policy="last", ordered=False, bloom_capacity=10)
+
+
+def test_bloom_filter_reports_membership() -> None:
+    bloom = BloomFilter(100)
+    assert bloom.add("a") is False
+    assert bloom.add("a") is True
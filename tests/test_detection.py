@@ -0,0 +1,75 @@
+"""Tests for streaming drift and anomaly detection."""
+
+import pytest
+from datetime import datetime
+
+from solid_engine.detection import CusumDetector, DriftDetector, EwmaDetector
+from solid_engine.models import SensorReading
+from solid_engine.report import ReportBuilder
+from solid_engine.simulation import ScenarioSimulator
+
+START = datetime(2025, 1, 1)
+
+
+def _scenario(sensor_id: str, drift_rate: float, seed: int = 7):
+    simulator = ScenarioSimulator(seed=seed, jitter=0.2)
+    return simulator.generate(
+        sensor_id, 10.0, count=200, start_time=START, drift_rate=drift_rate
+    )
+
+
+def test_drift_slope_recovers_simulated_drift_rate() -> None:
+    batches = [_scenario("flat", 0.0), _scenario("drifting", 0.02)]
+
+    lines = {line.sensor_id: line for line in ReportBuilder().build_drift(batches)}
+
+    assert lines["flat"].drift_slope == pytest.approx(0.0, abs=1e-3)
+    assert lines["drifting"].drift_slope == pytest.approx(0.02, abs=1e-3)
+    assert lines["flat"].anomalies == 0
+    assert lines["drifting"].anomalies > 0
+
+
+def test_detectors_keep_sensors_independent_when_interleaved() -> None:
+    flat = _scenario("flat", 0.0).readings
+    drifting = _scenario("drifting", 0.05).readings
+    interleaved = [reading for pair in zip(flat, drifting) for reading in pair]
+
+    events = list(DriftDetector().process(interleaved))
+
+    assert events
+    assert {event.sensor_id for event in events} == {"drifting"}
+
+
+def test_zscore_flags_single_spike() -> None:
+    readings = _scenario("spiky", 0.0).readings
+    spike = readings[150]
+    readings[150] = SensorReading(spike.sensor_id, spike.recorded_at, spike.value + 5, spike.expected)
+
+    events = list(DriftDetector(detectors=("zscore",)).process(readings))
+
+    assert [event.recorded_at for event in events] == [spike.recorded_at]
+
+
+def test_cusum_resets_after_alarm() -> None:
+    detector = CusumDetector(slack=0.0, limit=3.0)
+
+    scores = [detector.update(1.0) for _ in range(6)]
+
+    assert scores == [None, None, 3.0, None, None, 3.0]
+
+
+def test_drift_detector_rejects_unknown_detector() -> None:
+    with pytest.raises(ValueError, match="Unknown detectors"):
+        DriftDetector(detectors=("ewma", "magic"))
+
+
+def test_ewma_fires_once_per_excursion() -> None:
+    detector = EwmaDetector(alpha=0.5, limit=1.0)
+
+    biased = [detector.update(1.5) for _ in range(1000)]
+    recovered = [detector.update(0.0) for _ in range(5)]
+    again = [detector.update(1.5) for _ in range(5)]
+
+    assert sum(score is not None for score in biased) == 1
+    assert not any(recovered)
+    assert sum(score is not None for score in again) == 1
@@ -0,0 +1,278 @@
+"""Tests for CSV ingestion."""
+
+import csv
+import gzip
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from solid_engine.ingest import (
+    RowQuarantine,
+    detect_compression,
+    parse_records,
+    read_csv,
+    read_csv_parallel,
+    split_chunks,
+    summarize_csv_parallel,
+    summarize_sensors_parallel,
+)
+from solid_engine.metrics import ReliabilityMetrics
+
+
+def _write_csv(path: Path, rows: int, bad_row: int | None = None) -> Path:
+    start = datetime(2025, 1, 1)
+    lines = ["sensor_id,recorded_at,value,expected"]
+    for index in range(rows):
+        value = "oops" if index + 2 == bad_row else f"{10 + (index % 13) * 0.7:.3f}"
+        recorded_at = (start + timedelta(minutes=index)).isoformat()
+        lines.append(f"sensor-{index % 3},{recorded_at},{value},10.0")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_split_chunks_aligns_ranges_to_newlines(tmp_path) -> None:
+    path = _write_csv(tmp_path / "data.csv", 50)
+    content = path.read_bytes()
+
+    fieldnames, ranges = split_chunks(path, chunk_bytes=100)
+
+    assert fieldnames == ["sensor_id", "recorded_at", "value", "expected"]
+    assert len(ranges) > 1
+    assert ranges[-1][1] == len(content)
+    for start, end in ranges:
+        assert content[start - 1 : start] == b"\n"
+        assert content[end - 1 : end] == b"\n"
+
+
+def test_parallel_loader_matches_serial_loader(tmp_path) -> None:
+    path = _write_csv(tmp_path / "data.csv", 500)
+
+    parallel = list(read_csv_parallel(path, workers=3, chunk_bytes=1024))
+
+    assert parallel == list(read_csv(path))
+
+
+def test_parallel_loader_matches_serial_loader_for_aware_timestamps(tmp_path) -> None:
+    path = tmp_path / "aware.csv"
+    path.write_text(
+        "sensor_id,recorded_at,value,expected\n"
+        + "".join(f"s,2025-01-01T00:{minute:02d}:00+02:00,10.5,10.0\n" for minute in range(60)),
+        encoding="utf-8",
+    )
+
+    parallel = list(read_csv_parallel(path, workers=2, chunk_bytes=512))
+
+    assert [r.recorded_at.isoformat() for r in parallel] == [r.recorded_at.isoformat() for r in read_csv(path)]
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="needs /dev/shm to list segments")
+def test_parallel_loader_removes_unread_segments(tmp_path) -> None:
+    path = _write_csv(tmp_path / "data.csv", 500)
+    before = set(Path("/dev/shm").iterdir())
+
+    readings = read_csv_parallel(path, workers=2, chunk_bytes=512)
+    next(readings)
+    readings.close()
+
+    assert set(Path("/dev/shm").iterdir()) == before
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="needs /dev/shm to list segments")
+def test_segments_are_removed_when_the_parent_is_killed(tmp_path) -> None:
+    path = _write_csv(tmp_path / "data.csv", 2000)
+    script = (
+        "import sys, time\n"
+        "from pathlib import Path\n"
+        "from solid_engine.ingest import read_csv_parallel\n"
+        f"readings = read_csv_parallel(Path({str(path)!r}), 3, chunk_bytes=2000)\n"
+        "next(readings)\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    before = set(Path("/dev/shm").iterdir())
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    parent = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, env=env)
+    try:
+        assert parent.stdout.readline() == b"ready\n"
+        assert set(Path("/dev/shm").iterdir()) - before
+    finally:
+        parent.send_signal(signal.SIGKILL)
+        parent.wait()
+    deadline = time.monotonic() + 10
+    while set(Path("/dev/shm").iterdir()) - before and time.monotonic() < deadline:
+        time.sleep(0.2)
+
+    assert not set(Path("/dev/shm").iterdir()) - before
+
+
+def test_parallel_loader_reports_global_row_number(tmp_path) -> None:
+    path = _write_csv(tmp_path / "data.csv", 500, bad_row=377)
+
+    with pytest.raises(ValueError, match="row 377"):
+        list(read_csv_parallel(path, workers=3, chunk_bytes=1024))
+    with pytest.raises(ValueError, match="row 377"):
+        summarize_csv_parallel(path, workers=3, chunk_bytes=1024)
+
+
+def test_parallel_summary_matches_metrics(tmp_path) -> None:
+    path = _write_csv(tmp_path / "data.csv", 500)
+    expected = ReliabilityMetrics.from_readings(read_csv(path), outlier_threshold=5.0)
+
+    summary = summarize_csv_parallel(path, workers=2, chunk_bytes=2048)
+
+    assert summary.count == expected.count
+    assert summary.average_delta == pytest.approx(expected.average_delta)
+    assert summary.std_dev == pytest.approx(expected.std_dev)
+    assert summary.outlier_ratio == pytest.approx(expected.outlier_ratio)
+    assert summary.max_delta == pytest.approx(expected.max_delta)
+
+
+def test_parallel_sensor_summary_matches_per_sensor_metrics(tmp_path) -> None:
+    path = _write_csv(tmp_path / "data.csv", 500)
+    readings = list(read_csv(path))
+
+    summary = summarize_sensors_parallel(path, workers=2, chunk_bytes=2048)
+
+    assert list(summary) == ["sensor-0", "sensor-1", "sensor-2"]
+    for sensor_id, metrics in summary.items():
+        expected = ReliabilityMetrics.from_readings(r for r in readings if r.sensor_id == sensor_id)
+        assert metrics.count == expected.count
+        assert metrics.average_delta == pytest.approx(expected.average_delta)
+        assert metrics.std_dev == pytest.approx(expected.std_dev)
+        assert metrics.max_delta == pytest.approx(expected.max_delta)
+
+
+def test_gzip_input_is_read_transparently(tmp_path) -> None:
+    plain = _write_csv(tmp_path / "data.csv", 300)
+    compressed = tmp_path / "data.csv.gz"
+    compressed.write_bytes(gzip.compress(plain.read_bytes()))
+
+    assert detect_compression(compressed) == "gzip"
+    assert list(read_csv(compressed)) == list(read_csv(plain))
+    assert list(read_csv_parallel(compressed, workers=2)) == list(read_csv(plain))
+
+
+def test_gzip_input_keeps_row_numbers_in_errors(tmp_path) -> None:
+    plain = _write_csv(tmp_path / "data.csv", 300, bad_row=201)
+    compressed = tmp_path / "data.csv.gz"
+    compressed.write_bytes(gzip.compress(plain.read_bytes()))
+
+    with pytest.raises(ValueError, match="row 201"):
+        list(read_csv(compressed))
+
+
+def test_truncated_gzip_input_names_the_file(tmp_path) -> None:
+    plain = _write_csv(tmp_path / "data.csv", 3000)
+    truncated = tmp_path / "data.csv.gz"
+    truncated.write_bytes(gzip.compress(plain.read_bytes())[:5000])
+
+    with pytest.raises(IOError, match=f"Failed to read file {truncated}"):
+        list(read_csv(truncated))
+
+
+def test_zstd_input_is_read_transparently(tmp_path) -> None:
+    zstandard = pytest.importorskip("zstandard")
+    plain = _write_csv(tmp_path / "data.csv", 300)
+    compressed = tmp_path / "data.csv.zst"
+    compressed.write_bytes(zstandard.ZstdCompressor().compress(plain.read_bytes()))
+
+    assert list(read_csv(compressed)) == list(read_csv(plain))
+    truncated = tmp_path / "truncated.csv.zst"
+    truncated.write_bytes(compressed.read_bytes()[:-100])
+    with pytest.raises(IOError, match="Failed to read file"):
+        list(read_csv(truncated))
+
+
+def _write_with_bad_rows(path: Path) -> Path:
+    _write_csv(path, 100)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("sensor-9,2025-02-01T00:00:00,abc,10.0\n")
+        handle.write(",2025-02-01T00:01:00,10.0,10.0\n")
+        handle.write("sensor-9,2025-02-01T00:02:00,11.0,10.0\n")
+    return path
+
+
+def test_parse_records_rejects_rows_by_column() -> None:
+    records = [
+        ["s1", "2025-01-01T00:00:00", "10.5", "10"],
+        ["s1", "yesterday", "x", "10"],
+        ["", "2025-01-01T00:02:00", "10.5", "10"],
+        ["s1", "2025-01-01T00:03:00"],
+        ["s2", "2025-01-01T00:04:00", "9.5", "10", "extra"],
+    ]
+
+    readings, errors = parse_records(["sensor_id", "recorded_at", "value", "expected"], records)
+
+    assert [(r.sensor_id, r.delta) for r in readings] == [("s1", 0.5), ("s2", -0.5)]
+    assert sorted(errors) == [1, 2, 3]
+    assert "yesterday" in str(errors[1])
+    assert str(errors[2]) == "sensor_id cannot be empty"
+    assert isinstance(errors[3], TypeError)
+
+
+def test_quarantine_collects_bad_rows_and_keeps_loading(tmp_path) -> None:
+    path = _write_with_bad_rows(tmp_path / "data.csv")
+    quarantine = RowQuarantine(path=tmp_path / "rejected.csv")
+
+    readings = list(read_csv(path, quarantine))
+
+    assert len(readings) == 101
+    assert quarantine.stats.to_dict()["rejected"] == 2
+    with (tmp_path / "rejected.csv").open(encoding="utf-8") as handle:
+        rejected = list(csv.DictReader(handle))
+    assert [row["row"] for row in rejected] == ["102", "103"]
+    assert "sensor_id cannot be empty" in rejected[1]["reason"]
+
+
+def test_parallel_quarantine_reports_global_row_numbers(tmp_path) -> None:
+    path = _write_with_bad_rows(tmp_path / "data.csv")
+    quarantine = RowQuarantine(path=tmp_path / "rejected.csv")
+
+    metrics = summarize_csv_parallel(path, workers=2, chunk_bytes=512, quarantine=quarantine)
+
+    assert metrics.count == 101
+    assert quarantine.stats.rows == 103
+    with (tmp_path / "rejected.csv").open(encoding="utf-8") as handle:
+        assert [row["row"] for row in csv.DictReader(handle)] == ["102", "103"]
+
+
+def test_error_budget_fails_the_load(tmp_path) -> None:
+    path = _write_with_bad_rows(tmp_path / "data.csv")
+
+    with pytest.raises(ValueError, match="error budget of 1"):
+        list(read_csv(path, RowQuarantine(max_errors=1)))
+    with pytest.raises(ValueError, match="error budget"):
+        list(read_csv_parallel(path, workers=2, quarantine=RowQuarantine(max_error_ratio=0.01)))
+    assert len(list(read_csv(path, RowQuarantine(max_error_ratio=0.05)))) == 101
+
+
+def test_missing_column_fails_before_any_row_is_read(tmp_path) -> None:
+    path = tmp_path / "data.csv"
+    path.write_text("sensor_id,recorded_at,reading,expected\ns1,2025-01-01T00:00:00,10.0,10.0\n", encoding="utf-8")
+    quarantine = RowQuarantine(path=tmp_path / "rejected.csv")
+
+    with pytest.raises(ValueError, match="Missing required columns in .*: value"):
+        list(read_csv(path, quarantine))
+    with pytest.raises(ValueError, match="Missing required columns"):
+        summarize_csv_parallel(path, workers=2, quarantine=quarantine)
+    assert quarantine.stats.rows == 0
+    assert not (tmp_path / "rejected.csv").exists()
+
+
+def test_error_ratio_stops_the_load_early(tmp_path) -> None:
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "sensor_id,recorded_at,value,expected\n" + "s1,2025-01-01T00:00:00,bad,10.0\n" * 5000,
+        encoding="utf-8",
+    )
+    quarantine = RowQuarantine(path=tmp_path / "rejected.csv", max_error_ratio=0.1, min_ratio_rows=100)
+
+    with pytest.raises(ValueError, match="error budget"):
+        list(read_csv(path, quarantine))
+    assert quarantine.stats.rejected < 5000
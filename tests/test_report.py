@@ -1,3 +1,4 @@
+import pytest
 from datetime import datetime
 
 from solid_engine.models import ReadingBatch, SensorReading
@@ -20,3 +21,45 @@ def test_report_format_includes_source() -> None:
 
     assert "csv" in text
     assert "avg" in text
+
+
+def _sensor_readings() -> list[SensorReading]:
+    readings = []
+    for index in range(20):
+        for offset in (-1.0, 1.0, index * 0.5):
+            readings.append(
+                SensorReading(f"sensor-{index}", datetime(2025, 1, 1), 10 + offset, 10)
+            )
+    return readings
+
+
+def test_rank_returns_worst_sensors_by_max_delta() -> None:
+    builder = ReportBuilder()
+
+    top = builder.rank(builder.iter_sensor_lines(_sensor_readings()), 3, sort_by="max_delta")
+
+    assert [line.source for line in top] == ["sensor-19", "sensor-18", "sensor-17"]
+    assert top[0].max_delta == 9.5
+
+
+def test_rendered_lines_show_max_delta() -> None:
+    builder = ReportBuilder()
+    top = builder.rank(builder.iter_sensor_lines(_sensor_readings()), 1, sort_by="max_delta")
+
+    for style in ("table", "compact", "detailed"):
+        assert "9.5" in builder.render(top, style)
+
+
+def test_rank_rejects_unknown_sort_key() -> None:
+    with pytest.raises(ValueError, match="sort_by"):
+        ReportBuilder().rank([], 3, sort_by="count")
+
+
+def test_iter_render_pages_table_with_single_header() -> None:
+    builder = ReportBuilder()
+    lines = list(builder.iter_sensor_lines(_sensor_readings()))
+
+    pages = list(builder.iter_render(lines, page_size=8))
+
+    assert len(pages) == 3
+    assert "\n".join(pages) == builder.render(lines)
@@ -0,0 +1,130 @@
+"""Tests for rollup tables."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from solid_engine.metrics import ReliabilityMetrics
+from solid_engine.models import SensorReading
+from solid_engine.report import ReportBuilder
+from solid_engine.rollup import RollupStore
+from solid_engine.simulation import ScenarioSimulator
+
+START = datetime(2025, 1, 1, 22, 0, 0)
+
+
+def _readings() -> list[SensorReading]:
+    simulator = ScenarioSimulator(seed=3, jitter=4.0)
+    readings = []
+    for sensor_id in ("sensor-1", "sensor-2"):
+        batch = simulator.generate(
+            sensor_id, 10.0, count=2000, spacing_seconds=37, start_time=START
+        )
+        readings.extend(batch.readings)
+    return readings
+
+
+def _direct(readings, sensor_id, start, end) -> ReliabilityMetrics:
+    return ReliabilityMetrics.from_readings(
+        r for r in readings if r.sensor_id == sensor_id and start <= r.recorded_at < end
+    )
+
+
+def test_query_matches_raw_metrics_for_widened_range() -> None:
+    readings = _readings()
+    store = RollupStore.from_readings(readings)
+    start, end = store.align(
+        START + timedelta(minutes=7, seconds=13), START + timedelta(hours=19, minutes=3, seconds=5)
+    )
+
+    result = store.query(start, end)
+
+    assert (start, end) == (START + timedelta(minutes=7), START + timedelta(hours=19, minutes=4))
+    for sensor_id in ("sensor-1", "sensor-2"):
+        expected = _direct(readings, sensor_id, start, end)
+        actual = result[sensor_id].to_metrics()
+        assert actual.count == expected.count
+        assert actual.average_delta == pytest.approx(expected.average_delta)
+        assert actual.std_dev == pytest.approx(expected.std_dev)
+        assert actual.outlier_ratio == pytest.approx(expected.outlier_ratio)
+        assert actual.max_delta == pytest.approx(expected.max_delta)
+
+
+def test_unaligned_range_is_rejected() -> None:
+    store = RollupStore.from_readings(_readings())
+
+    with pytest.raises(ValueError, match="not aligned"):
+        store.query(START + timedelta(seconds=5), START + timedelta(hours=1))
+
+
+def test_timezone_aware_bounds_are_compared_in_utc() -> None:
+    store = RollupStore.from_readings(_readings())
+    plus_two = timezone(timedelta(hours=2))
+
+    aware = store.query(
+        START.replace(tzinfo=timezone.utc).astimezone(plus_two),
+        (START + timedelta(hours=3)).replace(tzinfo=timezone.utc).astimezone(plus_two),
+    )
+
+    assert aware == store.query(START, START + timedelta(hours=3))
+    assert aware["sensor-1"].count > 0
+
+
+def test_store_round_trips_through_disk(tmp_path) -> None:
+    readings = _readings()
+    store = RollupStore.from_readings(readings, outlier_threshold=3.0)
+    store.save(tmp_path)
+
+    loaded = RollupStore.load(tmp_path)
+    lines = ReportBuilder().build_range(loaded, *loaded.span())
+
+    assert loaded.outlier_threshold == 3.0
+    assert [line.source for line in lines] == ["sensor-1", "sensor-2"]
+    assert sum(line.count for line in lines) == len(readings)
+
+
+def test_query_only_reads_periods_it_needs(tmp_path) -> None:
+    RollupStore.from_readings(_readings()).save(tmp_path)
+    loaded = RollupStore.load(tmp_path)
+
+    loaded.query(START + timedelta(days=1), START + timedelta(days=1, hours=1))
+
+    assert list(loaded._partitions) == [("1h", "2025-01")]
+
+
+def test_append_merges_into_saved_store(tmp_path) -> None:
+    readings = _readings()
+    middle = START + timedelta(hours=10, seconds=30)
+    RollupStore.from_readings(r for r in readings if r.recorded_at < middle).save(tmp_path)
+
+    store = RollupStore.load(tmp_path)
+    store.extend(r for r in readings if r.recorded_at >= middle)
+    store.save()
+    merged = RollupStore.load(tmp_path)
+
+    full = RollupStore.from_readings(readings)
+    span = full.span()
+    assert merged.span() == span
+    assert merged.query(*span) == full.query(*span)
+    with pytest.raises(FileExistsError):
+        full.save(tmp_path)
+
+
+def test_disk_backed_store_flushes_finished_periods(tmp_path) -> None:
+    readings = _readings()
+    store = RollupStore(directory=tmp_path)
+    store.save()
+
+    store.extend(sorted(readings, key=lambda r: r.recorded_at))
+
+    assert sorted(store._partitions) == [("1d", "2025"), ("1h", "2025-01"), ("1m", "2025-01-02")]
+    assert (tmp_path / "1m" / "2025-01-01.csv").exists()
+    # Readings arriving after their period was flushed are merged back in.
+    unordered = RollupStore(directory=tmp_path / "unordered")
+    unordered.save()
+    unordered.extend(readings)
+    unordered.save()
+    store.save()
+    full = RollupStore.from_readings(readings)
+    span = full.span()
+    assert RollupStore.load(tmp_path).query(*span) == full.query(*span)
+    assert RollupStore.load(tmp_path / "unordered").query(*span) == full.query(*span)
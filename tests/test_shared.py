@@ -0,0 +1,82 @@
+"""Tests for the shared-memory reading transport."""
+
+import pytest
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
+
+from solid_engine.filters import filter_outliers
+from solid_engine.metrics import ReliabilityMetrics
+from solid_engine.models import ReadingBatch
+from solid_engine.shared import (
+    SharedColumns,
+    shared_filter_outliers,
+    shared_metrics,
+    simulate_shared,
+)
+from solid_engine.simulation import ScenarioSimulator
+
+START = datetime(2025, 1, 1, 0, 0, 0, 250)
+
+
+def _batch() -> ReadingBatch:
+    simulator = ScenarioSimulator(seed=5, jitter=8.0)
+    readings = []
+    for sensor_id in ("sensor-1", "sensor-2", "sensor-3"):
+        readings.extend(simulator.generate(sensor_id, 10.0, count=40, start_time=START).readings)
+    return ReadingBatch("test", readings)
+
+
+def test_round_trip_preserves_readings() -> None:
+    batch = _batch()
+
+    with SharedColumns.from_batch(batch) as columns:
+        assert columns.to_batch() == batch
+
+
+def test_aware_timestamps_round_trip_as_utc() -> None:
+    moment = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+    batch = ReadingBatch.from_iterable("tz", ScenarioSimulator().generate("s", 1.0, count=3, start_time=moment).readings)
+
+    with SharedColumns.from_batch(batch) as columns:
+        assert columns.reading(2).recorded_at == batch.readings[2].recorded_at
+
+
+def test_workers_compute_metrics_and_filters_from_segment() -> None:
+    batch = _batch()
+
+    with SharedColumns.from_batch(batch) as columns:
+        metrics = shared_metrics(columns, workers=2)
+        kept = shared_filter_outliers(columns, workers=2, threshold=5.0)
+
+    expected = ReliabilityMetrics.from_readings(batch.filter_by_sensor("sensor-2").readings)
+    assert metrics["sensor-2"].count == expected.count
+    assert metrics["sensor-2"].std_dev == pytest.approx(expected.std_dev)
+    assert metrics["sensor-2"].outlier_ratio == pytest.approx(expected.outlier_ratio)
+    assert [batch.readings[i] for i in kept] == filter_outliers(batch.readings, threshold=5.0)
+
+
+def test_simulation_workers_write_into_segment() -> None:
+    simulator = ScenarioSimulator(seed=9)
+
+    with simulate_shared(simulator, ("a", "b", "c"), 10.0, count=5, start_time=START, workers=2) as columns:
+        result = columns.to_batch()
+
+    assert result.readings[5:10] == simulator.generate("b", 10.0, count=5, start_time=START).readings
+
+
+def test_owner_unlinks_segment_on_close() -> None:
+    columns = SharedColumns.from_batch(_batch())
+    name = columns.handle.name
+    columns.close()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_owner_unlinks_segment_when_collected() -> None:
+    columns = SharedColumns.from_batch(_batch())
+    name = columns.handle.name
+    del columns
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)